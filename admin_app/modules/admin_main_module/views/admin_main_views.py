@@ -6,7 +6,8 @@ from src.database.orm_interface import ORMInterface
 
 
 def register_routes(module, orm: ORMInterface = None):
-    @module.route('/admin')
+    # The app is mounted at /admin by the Dispatcher, so its own root is /admin
+    @module.route('/')
     def admin_main_handler(request_context: RequestContext) -> Response:
         status: str = '200 OK'
         headers: List[Tuple[str, str]] = [('Content-type', 'text/plain')]
@@ -0,0 +1,52 @@
+"""
+Compares the response header storage with the previous one, a dict copied to a list on every access, on
+responses with many headers: building them, a few lookups and updates by middlewares, and serializing them for
+start_response.
+
+    $ python -m benchmarks.bench_headers
+"""
+import timeit
+
+from src.http.headers import Headers
+
+ITERATIONS = 20000
+
+
+def header_pairs(count: int):
+    return [('Content-Type', 'text/html; charset=utf-8')] + [(f'X-Header-{i}', f'value-{i}') for i in range(count)]
+
+
+def dict_headers(pairs):
+    # The previous storage: a dict (repeated names are lost) read through a list copy
+    headers = dict(pairs)
+    headers['Set-Cookie'] = 'session=abc'
+    headers['Set-Cookie'] = 'csrf=def'
+    headers.get('Content-Type')
+    list(headers.items())[-1]
+    for _ in list(headers.items()):
+        pass
+    return list(headers.items())
+
+
+def multi_headers(pairs):
+    headers = Headers(pairs)
+    headers.add('Set-Cookie', 'session=abc')
+    headers.add('Set-Cookie', 'csrf=def')
+    headers.get('Content-Type')
+    headers[-1]
+    for _ in headers:
+        pass
+    return headers.to_wsgi()
+
+
+def main():
+    print(f'{"headers":<12}{"dict + copies":>16}{"Headers":>12}   (µs per response)')
+    for count in (5, 20, 50):
+        pairs = header_pairs(count)
+        baseline = timeit.timeit(lambda: dict_headers(pairs), number=ITERATIONS) / ITERATIONS * 1e6
+        ours = timeit.timeit(lambda: multi_headers(pairs), number=ITERATIONS) / ITERATIONS * 1e6
+        print(f'{count + 3:<12}{baseline:>16.2f}{ours:>12.2f}')
+
+
+if __name__ == '__main__':
+    main()
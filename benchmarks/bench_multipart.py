@@ -0,0 +1,60 @@
+"""
+Measures the throughput and the peak memory of the multipart parser on large multi-file uploads.
+The peak memory should stay flat as the upload grows: files are spooled to disk past the spool threshold.
+
+    $ python -m benchmarks.bench_multipart
+"""
+import io
+import time
+import tracemalloc
+
+from src.core.request_body import DEFAULT_CHUNK_SIZE
+from src.http.multipart import parse_multipart
+
+BOUNDARY = b'----y-wsgi-benchmark'
+# (number of files, size of each file)
+UPLOADS = ((1, 1024 * 1024), (10, 1024 * 1024), (4, 16 * 1024 * 1024), (1, 64 * 1024 * 1024))
+SPOOL_THRESHOLD = 1024 * 1024
+
+
+def build_body(files: int, size: int) -> bytes:
+    body = io.BytesIO()
+    body.write(b'--' + BOUNDARY + b'\r\nContent-Disposition: form-data; name="title"\r\n\r\nbenchmark\r\n')
+    content = bytes(range(256)) * (size // 256)
+    for index in range(files):
+        body.write(b'--' + BOUNDARY + b'\r\n')
+        body.write(f'Content-Disposition: form-data; name="file{index}"; filename="file{index}.bin"\r\n'.encode())
+        body.write(b'Content-Type: application/octet-stream\r\n\r\n')
+        body.write(content)
+        body.write(b'\r\n')
+    body.write(b'--' + BOUNDARY + b'--\r\n')
+    return body.getvalue()
+
+
+def bench(body: bytes, chunk_size: int):
+    stream = io.BytesIO(body)
+    chunks = iter(lambda: stream.read(chunk_size), b'')
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    for part in parse_multipart(chunks, BOUNDARY, spool_threshold=SPOOL_THRESHOLD):
+        if part.is_file:
+            part.value.close()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    print(f'{"upload":<20}{"chunk":>10}{"MB/s":>10}{"peak KiB":>12}')
+    for files, size in UPLOADS:
+        body = build_body(files, size)
+        for chunk_size in (16 * 1024, DEFAULT_CHUNK_SIZE, 256 * 1024):
+            elapsed, peak = bench(body, chunk_size)
+            label = f'{files} x {size // (1024 * 1024)} MiB'
+            print(f'{label:<20}{chunk_size // 1024:>8}Ki{len(body) / elapsed / 1e6:>10.1f}{peak / 1024:>12.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,31 @@
+"""
+Compares parse_params with urllib's parse_qs on typical query strings of 10 to 50 parameters.
+
+    $ python -m benchmarks.bench_query_params
+"""
+import timeit
+from urllib.parse import parse_qs
+
+from src.http.multidict import parse_params
+
+ITERATIONS = 20000
+
+
+def query_string(count: int, quoted: bool) -> str:
+    value = 'caf%C3%A9+au+lait' if quoted else 'value'
+    return '&'.join(f'param{i}={value}{i}' for i in range(count)) + '&sort=asc&sort=desc'
+
+
+def main():
+    print(f'{"query string":<28}{"parse_qs":>12}{"parse_params":>14}   (µs per parse)')
+    for count in (10, 25, 50):
+        for quoted in (False, True):
+            qs = query_string(count, quoted)
+            baseline = timeit.timeit(lambda: parse_qs(qs), number=ITERATIONS) / ITERATIONS * 1e6
+            ours = timeit.timeit(lambda: parse_params(qs), number=ITERATIONS) / ITERATIONS * 1e6
+            label = f'{count} params{" (quoted)" if quoted else ""}'
+            print(f'{label:<28}{baseline:>12.2f}{ours:>14.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""
+Measures the memory and allocation time of the objects created for every request (Request, RequestContext,
+SessionContext, Session and Response) with many requests in flight, compared with the same classes without
+__slots__ (as they were before).
+
+    $ python -m benchmarks.bench_request_memory
+"""
+import gc
+import timeit
+import tracemalloc
+
+from src.core.request import Request
+from src.core.request_context import RequestContext
+from src.core.response import Response
+from src.core.session_context import SessionContext
+from src.session.session import Session
+
+CONCURRENCY = (100, 1000, 10000)
+REPEAT = 5
+ENVIRON = {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/users', 'QUERY_STRING': '', 'HTTP_HOST': 'localhost'}
+
+
+def without_slots(cls):
+    # The same class, with a per-instance __dict__ instead of slots
+    namespace = {name: value for name, value in vars(cls).items()
+                 if name not in cls.__slots__ and name not in ('__slots__', '__dict__', '__weakref__')}
+    return type(cls.__name__, (), namespace)
+
+
+SLOTTED = (Request, RequestContext, SessionContext, Session, Response)
+UNSLOTTED = tuple(without_slots(cls) for cls in SLOTTED)
+
+
+def handle_requests(classes, count: int):
+    request_cls, request_context_cls, session_context_cls, session_cls, response_cls = classes
+    in_flight = []
+    for _ in range(count):
+        request_context = request_context_cls(request_cls(dict(ENVIRON)), None)
+        request_context.session_context = session_context_cls(session_cls(user_id='guest'))
+        in_flight.append((request_context, response_cls(body=[b'ok'], headers=[('Content-Type', 'text/plain')])))
+    return in_flight
+
+
+def measure(classes, count: int):
+    gc.collect()
+    tracemalloc.start()
+    in_flight = handle_requests(classes, count)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del in_flight
+
+    # Timed separately, tracemalloc slows allocations down
+    elapsed = min(timeit.repeat(lambda: handle_requests(classes, count), number=1, repeat=REPEAT))
+    return size / count, elapsed / count * 1e6
+
+
+def main():
+    print(f'{"requests in flight":<20}{"":>14}{"bytes/request":>16}{"µs/request":>12}')
+    for count in CONCURRENCY:
+        for label, classes in (('__dict__', UNSLOTTED), ('__slots__', SLOTTED)):
+            size, elapsed = measure(classes, count)
+            print(f'{count:<20}{label:>14}{size:>16.0f}{elapsed:>12.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""
+Compares the debug mode (validated) and production (unchecked) paths of App._start_response on responses with
+many small chunks, sent like a WSGI server or FrameworkTestClient does (b''.join of the returned body).
+
+    $ python -m benchmarks.bench_response_iteration
+"""
+import timeit
+
+from src.app import App
+from src.core.response import Response, StreamingResponse
+
+ITERATIONS = 2000
+HEADERS = [('Content-Type', 'text/html; charset=utf-8')] + [(f'X-Header-{i}', f'value-{i}') for i in range(20)]
+
+
+def start_response(status, headers, exc_info=None):
+    pass
+
+
+def send(start, make_response):
+    return b''.join(start(make_response(), start_response, {}))
+
+
+def main():
+    print(f'{"response":<28}{"validated":>12}{"unchecked":>12}   (µs per request)')
+    for count in (10, 100, 1000):
+        chunks = [b'<li>item</li>'] * count
+        cases = (
+            (f'{count} chunks (list)', lambda: Response(body=chunks, headers=HEADERS)),
+            (f'{count} chunks (stream)', lambda: StreamingResponse(iter(chunks), headers=HEADERS)),
+        )
+        for label, make_response in cases:
+            validated = timeit.timeit(lambda: send(App._start_response_validated, make_response),
+                                      number=ITERATIONS) / ITERATIONS * 1e6
+            unchecked = timeit.timeit(lambda: send(App._start_response, make_response),
+                                      number=ITERATIONS) / ITERATIONS * 1e6
+            print(f'{label:<28}{validated:>12.2f}{unchecked:>12.2f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Compares the route matching strategies at different route table sizes.
+
+    $ python -m benchmarks.bench_router
+    $ python -m benchmarks.bench_router --app user_app   # benchmark the route table of a real app
+"""
+import argparse
+import importlib
+import timeit
+
+from src.routing.lazy_route import LazyRoute, PLACEHOLDER_PATTERN
+from src.routing.router import ROUTE_MATCHERS
+
+ROUTE_COUNTS = (10, 100, 1000)
+ITERATIONS = 2000
+
+
+def build_routes(count: int):
+    routes = []
+    for i in range(count // 2):
+        routes.append(LazyRoute(f'/resource{i}', 'module_dir', lambda: None, methods=['GET']))
+        routes.append(LazyRoute(f'/resource{i}/<int:id>', 'module_dir', lambda: None, methods=['GET']))
+    return routes
+
+
+def synthetic_cases(count: int):
+    last = count // 2 - 1
+    return {
+        'static (first)': '/resource0',
+        'static (last)': f'/resource{last}',
+        'dynamic (last)': f'/resource{last}/42',
+        'miss (404)': '/does/not/exist',
+    }
+
+
+def app_cases(routes):
+    # One request per registered route, with every placeholder filled in with a number
+    cases = {route.path: PLACEHOLDER_PATTERN.sub('1', route.path) for route in routes if '[' not in route.path}
+    cases['miss (404)'] = '/does/not/exist'
+    return cases
+
+
+def bench(engine: str, routes, cases):
+    matcher = ROUTE_MATCHERS[engine]()
+    for route in routes:
+        matcher.add(route)
+
+    results = {}
+    for label, path in cases.items():
+        seconds = timeit.timeit(lambda: matcher.match(path), number=ITERATIONS)
+        results[label] = seconds / ITERATIONS * 1e6
+    return results
+
+
+def report(title: str, routes, cases):
+    print(f'{title} (µs per match)')
+    print(f'  {"":<30}' + ''.join(f'{engine:>14}' for engine in ROUTE_MATCHERS))
+    results = {engine: bench(engine, routes, cases) for engine in ROUTE_MATCHERS}
+    for label in cases:
+        print(f'  {label:<30}' + ''.join(f'{results[engine][label]:14.2f}' for engine in ROUTE_MATCHERS))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--app', help='benchmark the routes registered by <app>.main instead of synthetic ones')
+    args = parser.parse_args()
+
+    if args.app:
+        app = importlib.import_module(f'{args.app}.main').app
+        routes = [route for route in app.router.routes if 'GET' in route.methods]
+        report(f'{args.app}: {len(routes)} GET routes', routes, app_cases(routes))
+        return
+
+    for count in ROUTE_COUNTS:
+        report(f'{count} routes', build_routes(count), synthetic_cases(count))
+
+
+if __name__ == '__main__':
+    main()
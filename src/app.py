@@ -1,16 +1,22 @@
 import importlib
 import os
+import sys
+from contextvars import Token
 
-from typing import Callable, Dict, Any, List, Tuple, Iterable, Type, Union, Optional
+from typing import Callable, Dict, Any, IO, List, Tuple, Iterable, Iterator, Type, Union, Optional
 
 from src.hooks.hooks import Hooks
 from src.middleware.middleware import Middleware
 from src.core.request import Request
 from src.core.request_context import RequestContext
-from src.core.response import Response
+from src.core.response import Response, validate_body
+from src.core.prebuilt_response import BAD_REQUEST, INTERNAL_SERVER_ERROR, NOT_FOUND, REQUEST_ENTITY_TOO_LARGE
+from src.core.request_body import DEFAULT_SPOOL_THRESHOLD, RequestEntityTooLarge
+from src.http.multidict import TooManyParameters
+from src.http.multipart import MultipartError
 from src.routing.router import Router
 from src.core.view import View
-from src.core.app_context import AppContext
+from src.core.app_context import AppContext, current_request_context
 from src.templates.simple_template_engine import SimpleTemplateEngine
 from src.templates.jinja2_template_engine import Jinja2TemplateEngine
 
@@ -25,13 +31,30 @@ HandlerType = Union[Type[View], Callable[[RequestContext, Dict[str, Any]], Respo
 
 
 class App:
-    def __init__(self, name: str, template_engine: str = None):
+    def __init__(self, name: str, template_engine: str = None, route_cache_size: int = 0,
+                 router_engine: str = None, max_content_length: Optional[int] = None,
+                 body_spool_threshold: int = DEFAULT_SPOOL_THRESHOLD, debug: bool = False):
         self.name = name
-        self.router = Router()
+        # In debug mode every response is validated before it is sent (status and header types, bytes chunks),
+        # otherwise it is handed to the server unchecked
+        self.debug = debug
+        if debug:
+            self._start_response = self._start_response_validated
+        # Requests with a larger body are answered 413, bodies larger than body_spool_threshold are buffered on disk
+        self.max_content_length = max_content_length
+        self.body_spool_threshold = body_spool_threshold
+        self.router = Router(cache_size=route_cache_size, engine=router_engine)
         self.middlewares: List[Middleware] = []
         self.hooks = Hooks()
         self.context: Optional[AppContext] = None
         self.modules: Dict[str, Any] = {}
+        # Mount point of the app, set by the Dispatcher and prepended to the URLs built by url_for
+        self.script_name = ''
+        # Bound middleware methods, rebuilt whenever a middleware is registered, skipping the ones that keep
+        # the no-op implementation of the Middleware base class
+        self._before_request_middlewares: Tuple[Callable, ...] = ()
+        self._after_request_middlewares: Tuple[Callable, ...] = ()
+        self.frozen = False
 
         # Initialize the template engine
         if template_engine is None:
@@ -63,54 +86,125 @@ class App:
         return module.__file__
 
     # decorator
-    def route(self, path: str, methods: List[str] = None) -> Callable[[HandlerType], HandlerType]:
+    def route(self, path: str, methods: List[str] = None, name: str = None) -> Callable[[HandlerType], HandlerType]:
         def wrapper(handler: HandlerType) -> HandlerType:
+            self._check_not_frozen()
             # Determine module directory using the handler's __module__ attribute
             module_file_path = self.get_module_path(handler)
             module_views_dir = os.path.dirname(module_file_path)
             module_dir = os.path.dirname(module_views_dir)
 
             def wrapped_handler(request_context: RequestContext, *args, **kwargs):
-                self.context.set_current_module_dir(module_dir)
+                request_context.current_module_dir = module_dir
                 if isinstance(handler, type):
                     handler_instance = handler()
                     return handler_instance(request_context, *args, **kwargs)
                 else:
                     return handler(request_context, *args, **kwargs)
 
-            self.router.add_route(path, module_dir, wrapped_handler, methods)
+            # Routes are named after their handler unless a name is given, e.g. url_for('get_user', id=1)
+            self.router.add_route(path, module_dir, wrapped_handler, methods, name=name or handler.__name__)
             return handler
         return wrapper
 
+    def url_for(self, name: str, /, **params: Any) -> str:
+        return self.script_name + self.router.url_for(name, params)
+
+    # Bulk variant of url_for, e.g. for the links of a listing page
+    def urls_for(self, name: str, params_list: Iterable[Dict[str, Any]]) -> List[str]:
+        return [self.script_name + url for url in self.router.urls_for(name, params_list)]
+
     def use_middleware(self, middleware_cls: Callable[[], Middleware]) -> None:
+        self._check_not_frozen()
         self.middlewares.append(middleware_cls())
+        self._before_request_middlewares = tuple(
+            middleware.before_request for middleware in self.middlewares
+            if type(middleware).before_request is not Middleware.before_request)
+        self._after_request_middlewares = tuple(
+            middleware.after_request for middleware in self.middlewares
+            if type(middleware).after_request is not Middleware.after_request)
 
     def before_request(self, hook: Callable) -> None:
+        self._check_not_frozen()
         self.hooks.add_before_request(hook)
 
     def after_request(self, hook: Callable) -> None:
+        self._check_not_frozen()
         self.hooks.add_after_request(hook)
 
     def teardown_request(self, hook: Callable) -> None:
+        self._check_not_frozen()
         self.hooks.add_teardown_request(hook)
 
     def before_first_request(self, hook: Callable) -> None:
+        self._check_not_frozen()
         self.hooks.add_before_first_request(hook)
 
-    def __call__(self, environ: Dict[str, Any], start_response: StartResponseType) -> Iterable[bytes]:
-        request = Request(environ)
-        request_context = RequestContext(request, self.context)
-
-        # Apply before_first_request hooks
-        if self.hooks.first_request:
-            for hook in self.hooks.before_first_request_hooks:
-                hook()
-            self.hooks.first_request = False
+    # Runs once every module and plugin has registered: resolves the route handlers, builds the routing index,
+    # turns middlewares and hooks into tuples and rejects any further registration
+    def freeze(self) -> None:
+        if self.frozen:
+            return
+        self.router.freeze()
+        self.middlewares = tuple(self.middlewares)
+        self.hooks.freeze()
+        self.frozen = True
+
+    def dump_routes(self) -> str:
+        lines = [f"Routes of app '{self.name}'" + (" (frozen)" if self.frozen else "")]
+        for route in self.router.route_table():
+            params = ', '.join(f'{name}: {converter}' for name, converter in route['params'].items())
+            lines.append(f"  {','.join(route['methods']):<16} {route['path']:<40} {route['name'] or '-':<28} "
+                         f"{'static' if route['static'] else params or 'dynamic'}")
+        return '\n'.join(lines)
+
+    def _check_not_frozen(self) -> None:
+        if self.frozen:
+            raise RuntimeError(f"App '{self.name}' is frozen and cannot be modified")
 
-        # Apply middleware and before_request hooks
+    def __call__(self, environ: Dict[str, Any], start_response: StartResponseType) -> Iterable[bytes]:
+        request = Request(environ, self.max_content_length, self.body_spool_threshold)
+        if request.too_large:
+            # Rejected from its Content-Length alone, before any middleware or hook runs
+            return REQUEST_ENTITY_TOO_LARGE(environ, start_response)
+
+        request_context = RequestContext(request, self.context, self)
+        # The only per-request write to shared state: a context variable, for the rare implicit lookups
+        # (render_template, AppContext.get_current_app_name) made without the request context at hand
+        token = current_request_context.set(request_context)
+        close_request = _RequestCloser(request_context, token)
+        try:
+            response = self._handle(request_context)
+            if getattr(response, 'file', None) is not None and environ.get('wsgi.file_wrapper') is not None:
+                # The server sends and closes the file itself, the request is released along with it
+                response.file = _ClosingFile(response.file, close_request)
+                return self._start_response(response, start_response, environ)
+            body = self._start_response(response, start_response, environ)
+        except RequestEntityTooLarge:
+            close_request()
+            # A body without Content-Length went past max_content_length while it was read
+            return REQUEST_ENTITY_TOO_LARGE(environ, start_response)
+        except (MultipartError, TooManyParameters):
+            close_request()
+            # Malformed form, or one with too many parameters
+            return BAD_REQUEST(environ, start_response)
+        except BaseException:
+            close_request()
+            raise
+
+        if isinstance(body, (list, tuple)):
+            # Already in memory, nothing reads the request anymore
+            close_request()
+            return body
+        # A body produced while it is sent may still read the request (e.g. stream an upload): the request is
+        # released once the server closes the body
+        return _RequestBodyIterator(body, close_request, environ, start_response)
+
+    def _handle(self, request_context: RequestContext) -> Response:
+        # Apply middleware and before_request hooks (before_first_request hooks included)
         response = self._apply_before_request_middlewares_and_hooks(request_context)
         if response:
-            return self._start_response(response, start_response)
+            return response
 
         handler, params = self.router.match(request_context.path, request_context.method)
         # print(f"Matched handler: {handler}, Params: {params}")
@@ -122,22 +216,36 @@ class App:
             elif callable(handler):
                 response = handler(request_context, **params)
             else:
-                response = Response(status='500 Internal Server Error', headers=[('Content-type', 'text/plain')],
-                                    body=[b'Internal Server Error'])
+                response = INTERNAL_SERVER_ERROR.to_response()
         else:
-            response = Response(status='404 Not Found', headers=[('Content-type', 'text/plain')], body=[b'Not Found'])
+            response = self._unmatched_response(request_context)
 
         # Ensure response is always a Response object
         if not isinstance(response, Response):
-            response = Response(status='500 Internal Server Error', headers=[('Content-type', 'text/plain')],
-                                body=[b'Internal Server Error'])
+            response = INTERNAL_SERVER_ERROR.to_response()
 
         # Apply after_request hooks and middleware
         response = self._apply_after_request_middlewares_and_hooks(request_context, response)
         # Apply teardown_request hooks
         self._apply_teardown_request_hooks(request_context.request)
 
-        return self._start_response(response, start_response)
+        return response
+
+    # Answers requests whose method has no route for the path: automatic OPTIONS and HEAD, then 405 or 404
+    def _unmatched_response(self, request_context: RequestContext) -> Response:
+        allowed_methods = self.router.allowed_methods(request_context.path)
+        if not allowed_methods:
+            # A copy, since middlewares and after_request hooks may modify the response
+            return NOT_FOUND.to_response()
+
+        allow = ', '.join(allowed_methods)
+        if request_context.method == 'OPTIONS':
+            return Response(status='204 No Content', headers=[('Allow', allow)])
+        if request_context.method == 'HEAD' and 'GET' in allowed_methods:
+            # The GET view is not invoked, HEAD only confirms the resource exists
+            return Response(status='200 OK')
+        return Response(status='405 Method Not Allowed', headers=[('Content-type', 'text/plain'), ('Allow', allow)],
+                        body=[b'Method Not Allowed'])
 
     def _apply_before_request_middlewares_and_hooks(self, request_context: RequestContext) -> Optional[Response]:
         if self.hooks.first_request:
@@ -148,15 +256,15 @@ class App:
         for hook in self.hooks.before_request_hooks:
             hook()
 
-        for middleware in self.middlewares:
-            response = middleware.before_request(request_context)
+        for before_request in self._before_request_middlewares:
+            response = before_request(request_context)
             if response:
                 return response
         return None
 
     def _apply_after_request_middlewares_and_hooks(self, request_context: RequestContext, response: Response) -> Response:
-        for middleware in self.middlewares:
-            response = middleware.after_request(request_context, response)
+        for after_request in self._after_request_middlewares:
+            response = after_request(request_context, response)
         for hook in self.hooks.after_request_hooks:
             hook()
         return response
@@ -166,20 +274,113 @@ class App:
             hook()
 
     @staticmethod
-    def _start_response(response: Response, start_response: StartResponseType) -> Iterable[bytes]:
-        response_status: str = response.status
-        response_headers: List[Tuple[str, str]] = response.headers
-
-        # Ensure that the response status and headers are correctly typed
-        assert isinstance(response_status, str), f"Expected str, got {type(response_status).__name__}"
-        assert isinstance(response_headers, list) and all(isinstance(header, tuple) for header in response_headers), \
-            "Headers should be a list of tuples"
+    def _start_response(response: Response, start_response: StartResponseType,
+                        environ: Dict[str, Any]) -> Iterable[bytes]:
+        # The headers are serialized once, the server gets its own list
+        start_response(response.status, response.headers.to_wsgi(), None)
+        # An iterable yielding byte strings (a streaming response may hand a file to wsgi.file_wrapper)
+        return response.wsgi_body(environ)
+
+    # The debug mode variant of _start_response
+    @staticmethod
+    def _start_response_validated(response: Response, start_response: StartResponseType,
+                                  environ: Dict[str, Any]) -> Iterable[bytes]:
+        response_status = response.status
+        response_headers = response.headers.to_wsgi()
+        if not isinstance(response_status, str):
+            raise TypeError(f"Expected str status, got {type(response_status).__name__}")
+        for header in response_headers:
+            if not (isinstance(header, tuple) and len(header) == 2 and isinstance(header[0], str)
+                    and isinstance(header[1], str)):
+                raise TypeError(f"Headers should be (str, str) tuples, got {header!r}")
 
         start_response(response_status, response_headers, None)
 
-        # An iterable yielding byte strings
-        return response.body
+        body = response.wsgi_body(environ)
+        # A file sent with wsgi.file_wrapper is read by the server, as bytes since files are opened in binary mode
+        if getattr(response, 'file', None) is not None and environ.get('wsgi.file_wrapper') is not None:
+            return body
+        return validate_body(body)
 
     def render_template(self, template_name: str, template_vars: Dict[str, Any]) -> str:
         template_dir = self.context.get_current_module_dir() + '/templates'
-        return self.template_engine.render(template_dir, template_name, template_vars)
+        return self.template_engine.render(template_dir, template_name, {'url_for': self.url_for, **template_vars})
+
+
+class _RequestCloser:
+    # Resets the request context variable and closes the request (spooled body, uploads), once
+    __slots__ = ('_request_context', '_token')
+
+    def __init__(self, request_context: RequestContext, token: Token) -> None:
+        self._request_context: Optional[RequestContext] = request_context
+        self._token = token
+
+    def __call__(self) -> None:
+        request_context, self._request_context = self._request_context, None
+        if request_context is None:
+            return
+        try:
+            current_request_context.reset(self._token)
+        except ValueError:
+            # The server closed the body from another context, the variable was never set there
+            pass
+        request_context.close()
+
+
+class _RequestBodyIterator:
+    """
+    The body handed to the server when it is produced while it is sent: the request is closed when the server
+    closes the body (PEP 3333). A request body that turns out too large or malformed while the response is produced
+    is still answered 413 or 400, as long as nothing was sent yet.
+    """
+    __slots__ = ('_body', '_iterator', '_close_request', '_environ', '_start_response', '_sent')
+
+    def __init__(self, body: Iterable[bytes], close_request: _RequestCloser, environ: Dict[str, Any],
+                 start_response: StartResponseType) -> None:
+        self._body = body
+        self._iterator: Iterator[bytes] = iter(body)
+        self._close_request = close_request
+        self._environ = environ
+        self._start_response = start_response
+        self._sent = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self
+
+    def __next__(self) -> bytes:
+        try:
+            chunk = next(self._iterator)
+        except (RequestEntityTooLarge, MultipartError, TooManyParameters) as error:
+            if self._sent:
+                raise
+            error_response = REQUEST_ENTITY_TOO_LARGE if isinstance(error, RequestEntityTooLarge) else BAD_REQUEST
+            exc_info = sys.exc_info()
+            self._iterator = iter(error_response(
+                self._environ, lambda status, headers: self._start_response(status, headers, exc_info)))
+            self._sent = True
+            return next(self._iterator, b'')
+        self._sent = True
+        return chunk
+
+    def close(self) -> None:
+        try:
+            if hasattr(self._body, 'close'):
+                self._body.close()
+        finally:
+            self._close_request()
+
+
+class _ClosingFile:
+    # A file handed to wsgi.file_wrapper, which closes the request along with the file
+    def __init__(self, file: IO[bytes], close_request: _RequestCloser) -> None:
+        self._file = file
+        self._close_request = close_request
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._file, name)
+
+    def close(self) -> None:
+        try:
+            self._file.close()
+        finally:
+            self._close_request()
@@ -4,7 +4,9 @@ from typing import Any, Dict, List
 from src.app import App
 from src.core.module import Module
 from src.core.app_context import AppContext
+from src.core.request_body import DEFAULT_SPOOL_THRESHOLD
 from src.config_loader import load_config
+from src.logger.logger import configure_logging
 
 
 class AppRegistry:
@@ -20,7 +22,15 @@ class AppRegistry:
             base_dir = self._get_app_base_dir(name)
             # print("Checking base dir:", base_dir)
             config = load_config(name, base_dir)
-            app = App(name, config.TEMPLATE_ENGINE if config.TEMPLATE_ENGINE else None)
+            # Framework debug logging is global, any app running in DEBUG turns it on
+            if getattr(config, 'DEBUG', False):
+                configure_logging(debug=True)
+            app = App(name, config.TEMPLATE_ENGINE if config.TEMPLATE_ENGINE else None,
+                      route_cache_size=getattr(config, 'ROUTE_CACHE_SIZE', 0),
+                      router_engine=getattr(config, 'ROUTER_ENGINE', None),
+                      max_content_length=getattr(config, 'MAX_CONTENT_LENGTH', None),
+                      body_spool_threshold=getattr(config, 'BODY_SPOOL_THRESHOLD', DEFAULT_SPOOL_THRESHOLD),
+                      debug=getattr(config, 'DEBUG', False))
             # print("Loaded config:", config)
             app_context = AppContext()
             app_context.set_context(name, base_dir, config, app)
@@ -63,6 +73,11 @@ class AppRegistry:
     def list_apps(self) -> List[str]:
         return list(self._apps.keys())
 
+    # To be called once every module and plugin has registered its routes, middlewares and hooks
+    def freeze_all(self) -> None:
+        for app in self._apps.values():
+            app.freeze()
+
     @staticmethod
     def _get_app_base_dir(app_name: str) -> str:
         current_dir = os.path.dirname(os.path.abspath(__file__))
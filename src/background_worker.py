@@ -1,6 +1,10 @@
 import time
 import threading
 
+from src.logger.logger import get_logger
+
+logger = get_logger(__name__)
+
 
 class BackgroundWorker:
     def __init__(self):
@@ -15,6 +19,11 @@ class BackgroundWorker:
         with self._task_lock:
             self.tasks.append((task, args, kwargs))
 
+    # Number of tasks waiting to be executed
+    @property
+    def queue_depth(self) -> int:
+        return len(self.tasks)
+
     def _worker(self):
         while not self._stop_event.is_set() or self.tasks:
             with self._task_lock:
@@ -27,7 +36,7 @@ class BackgroundWorker:
                 try:
                     task(*args, **kwargs)
                 except Exception as e:
-                    print(f"Error executing task: {e}")
+                    logger.error("Error executing task", error=e)
             else:
                 time.sleep(0.1)
 
@@ -5,6 +5,7 @@ from hashlib import md5
 from src.cache.simple_cache import SimpleCache
 from src.core.request_context import RequestContext
 from src.core.response import Response
+from src.http.headers import Headers, etag_matches
 
 
 def cache_view(timeout=None):
@@ -14,7 +15,7 @@ def cache_view(timeout=None):
         @wraps(func)
         def wrapped(request_context: RequestContext, *args, **kwargs):
             # Save the current module directory
-            current_module_dir = request_context.current_app.context.get_current_module_dir()
+            current_module_dir = request_context.get_current_module_dir()
 
             cache_key = f"{request_context.path}"
             cached_response = cache.get(cache_key)
@@ -22,23 +23,30 @@ def cache_view(timeout=None):
             if cached_response:
                 # print("Cache hit, returning cached response.")
                 # Restore the module directory for cached responses
-                request_context.current_app.context.set_current_module_dir(current_module_dir)
+                request_context.set_current_module_dir(current_module_dir)
 
                 # Check for conditional headers (If-None-Match, If-Modified-Since)
-                if 'If-None-Match' in request_context.request.headers:
-                    if request_context.request.headers['If-None-Match'] == cached_response.headers_dict.get('ETag'):
-                        return Response(status='304 Not Modified', headers=cached_response.headers_dict)
+                # Weak comparison, so the W/ ETag of a compressed variant (see CompressionMiddleware) matches too
+                if_none_match = request_context.request.headers.get('If-None-Match')
+                etag = cached_response.headers_dict.get('ETag')
+                if if_none_match and etag and etag_matches(if_none_match, etag):
+                    return Response(status=304, headers=cached_response.headers_dict)
 
                 if 'If-Modified-Since' in request_context.request.headers:
                     last_modified = cached_response.headers_dict.get('Last-Modified')
                     if last_modified and request_context.request.headers['If-Modified-Since'] == last_modified:
-                        return Response(status='304 Not Modified', headers=cached_response.headers_dict)
+                        return Response(status=304, headers=cached_response.headers_dict)
 
-                return cached_response
+                # A copy: middlewares (e.g. SessionMiddleware adding its cookie) modify the response they get
+                return _copy_response(cached_response)
 
             # print("Cache miss, calling the original view function.")
             # Call the original view function
             response: Response = func(request_context, *args, **kwargs)
+            if response.streaming:
+                # A streaming body can only be sent once, it is never cached
+                request_context.set_current_module_dir(current_module_dir)
+                return response
 
             # Generate and set caching headers
             response.set_header("Cache-Control", f"max-age={timeout}")
@@ -47,18 +55,24 @@ def cache_view(timeout=None):
             last_modified = datetime.utcnow().strftime('%a, %d %b %Y %H:%M:%S GMT')
             response.set_header("Last-Modified", last_modified)
 
-            # Generate ETag based on the response body
-            data = response.body[0]
-            if isinstance(data, int):
-                data = str(data).encode('utf-8')  # Convert int to str and then encode to bytes
-            etag = md5(data).hexdigest()
-            response.set_header("ETag", etag)
+            # Generate ETag based on the whole response body
+            body = [str(chunk).encode('utf-8') if isinstance(chunk, int) else chunk for chunk in response.body]
+            response.body = body
+            etag = md5(b''.join(body)).hexdigest()
+            response.set_header("ETag", f'"{etag}"')
 
             # Restore the module directory after the view function is executed
-            request_context.current_app.context.set_current_module_dir(current_module_dir)
+            request_context.set_current_module_dir(current_module_dir)
 
-            cache.set(cache_key, response)
+            # The cached copy never holds a cookie, it would be sent to every visitor
+            cached_response = _copy_response(response)
+            cached_response.headers_dict.pop('Set-Cookie', None)
+            cache.set(cache_key, cached_response)
             # print("Response cached.")
             return response
         return wrapped
     return decorator
+
+
+def _copy_response(response: Response) -> Response:
+    return Response(body=list(response.body), status=response.status, headers=Headers(response.headers))
@@ -17,6 +17,8 @@ class Config:
 
     SESSION_EXPIRY = 3600  # Session expiry time in seconds (e.g., 1 hour)
     SESSION_ID_ROTATION_INTERVAL = 1800  # Session ID rotation interval in seconds (e.g., 30 minutes)
+    # JSON requests are checked for a CSRF token (X-CSRF-Token header) unless explicitly exempted
+    CSRF_EXEMPT_JSON = os.getenv("CSRF_EXEMPT_JSON", "False") == "True"
     # Framework-specific configuration
 
     # Define the allowed origins, methods, and headers
@@ -26,5 +28,22 @@ class Config:
 
     TEMPLATE_ENGINE = "jinja2"
 
+    # JSON backend of requests and responses: "orjson", "ujson", "json" or "auto" (the fastest installed one)
+    JSON_CODEC = os.getenv("JSON_CODEC", "auto")
+
+    # Request bodies: larger requests are answered 413 (0 disables the limit), and bodies larger than the
+    # spool threshold are buffered in a temporary file instead of in memory
+    MAX_CONTENT_LENGTH = int(os.getenv("MAX_CONTENT_LENGTH", 16 * 1024 * 1024)) or None
+    BODY_SPOOL_THRESHOLD = int(os.getenv("BODY_SPOOL_THRESHOLD", 1024 * 1024))
+
+    # Served from memory by the Dispatcher for /favicon.ico, an empty 204 is answered when unset
+    FAVICON_PATH = os.getenv("FAVICON_PATH")
+    # How long the results of the /readyz checks are reused, in seconds
+    READINESS_CACHE_TTL = float(os.getenv("READINESS_CACHE_TTL", 1.0))
+
+    # Routing configuration
+    ROUTER_ENGINE = os.getenv("ROUTER_ENGINE", "trie")  # One of "trie", "alternation" or "linear"
+    ROUTE_CACHE_SIZE = int(os.getenv("ROUTE_CACHE_SIZE", 0))  # Memoized (method, path) matches, 0 disables the cache
+
 
 config = Config()
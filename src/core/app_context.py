@@ -1,17 +1,22 @@
-import threading
-
+from contextvars import ContextVar
 from typing import Any, Dict, Optional, TYPE_CHECKING
 
 from src.forms.form_mediator import FormMediator
 
 if TYPE_CHECKING:
     from src.app import App
+    from src.core.request_context import RequestContext
+
+# The RequestContext being handled, set once per request by App.__call__.
+# Context variables are isolated per thread, greenlet (gevent) and asyncio task.
+current_request_context: ContextVar[Optional['RequestContext']] = ContextVar('current_request_context', default=None)
+# Fallbacks used outside of a request (e.g. while apps and modules are being registered)
+_current_app_name: ContextVar[Optional[str]] = ContextVar('current_app_name', default=None)
+_current_module_dir: ContextVar[Optional[str]] = ContextVar('current_module_dir', default=None)
 
 
 class AppContext:
     _configs: Dict[str, Dict[str, Optional[str]]] = {}  # Global dictionary for storing app contexts
-    _current_app_name = threading.local()  # Thread-local storage for current app
-    _current_module_dir = threading.local()
     _form_mediator: Optional[FormMediator] = None
 
     def set_context(self, app_name: str, base_dir: str, config: Dict[str, Optional[str]] = None,
@@ -24,14 +29,17 @@ class AppContext:
         }
 
     def set_current_app_name(self, app_name: str | None):
-        self._current_app_name.app_name = app_name  # Store current app name in thread-local storage
+        _current_app_name.set(app_name)
 
     def get_current_app_name(self) -> Optional[str]:
-        # Retrieve current app name from thread-local storage
-        return getattr(self._current_app_name, 'app_name', None)
+        # During a request the app is carried by the request context itself
+        request_context = current_request_context.get()
+        if request_context is not None and request_context.app is not None:
+            return request_context.app.name
+        return _current_app_name.get()
 
     def reset_current_app_name(self):
-        self._current_app_name.app_name = None
+        _current_app_name.set(None)
 
     def get_config(self, app_name: str = None) -> Optional[Dict[str, Optional[str]]]:
         if app_name is None:
@@ -58,10 +66,17 @@ class AppContext:
         return app_instance.modules if app_instance else None
 
     def set_current_module_dir(self, module_dir: str):
-        self._current_module_dir.module_dir = module_dir
+        request_context = current_request_context.get()
+        if request_context is not None:
+            request_context.current_module_dir = module_dir
+        else:
+            _current_module_dir.set(module_dir)
 
     def get_current_module_dir(self) -> Optional[str]:
-        return getattr(self._current_module_dir, 'module_dir', None)
+        request_context = current_request_context.get()
+        if request_context is not None and request_context.current_module_dir is not None:
+            return request_context.current_module_dir
+        return _current_module_dir.get()
 
     def set_form_mediator(self, form_mediator: FormMediator):
         self._form_mediator = form_mediator
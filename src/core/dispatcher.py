@@ -1,39 +1,96 @@
-from typing import Callable, Dict, Any, Tuple, Iterable
-from src.core.response import Response
+from typing import Callable, Dict, Any, List, Tuple, Iterable, Optional
+from src.core.health import HEALTHY, ReadinessCheck, ReadinessProbe
+from src.core.prebuilt_response import FileResponse, NO_CONTENT, NOT_FOUND
+from src.middleware.wsgi_middleware import WSGIApp
 from src.app import App
 
 StartResponseType = Callable[[str, list[Tuple[str, str]], Any], None]
 
 
-class Dispatcher:
+class _MountNode:
+    __slots__ = ('children', 'app')
+
     def __init__(self):
+        self.children: Dict[str, '_MountNode'] = {}
+        self.app: Optional[App] = None
+
+
+class Dispatcher:
+    def __init__(self, favicon_path: Optional[str] = None, health_path: str = '/healthz',
+                 readiness_path: str = '/readyz', readiness_cache_ttl: float = 1.0):
+        # Mount prefix -> app, in registration order (the trie below is what dispatch uses)
         self.apps: Dict[str, Callable[[Dict[str, Any], StartResponseType], Iterable[bytes]]] = {}
+        self._mounts = _MountNode()
+        self.readiness = ReadinessProbe(readiness_cache_ttl)
+        # Paths answered by the Dispatcher itself, without running any app pipeline. The favicon is read once and
+        # served from memory (without one an empty 204 is answered), load balancer probes get precomputed bytes.
+        self._fixed_routes: Dict[str, WSGIApp] = {
+            '/favicon.ico': FileResponse(favicon_path) if favicon_path else NO_CONTENT,
+            health_path: HEALTHY,
+            readiness_path: self.readiness,
+        }
+        # WSGI middlewares wrapping the whole dispatch, and the resulting application
+        self._middlewares: List[Tuple[Callable[..., WSGIApp], tuple, dict]] = []
+        self._wsgi_app: WSGIApp = self.dispatch
+
+    def use(self, middleware_factory: Callable[..., WSGIApp], *args, **kwargs) -> None:
+        """
+        Wraps the dispatch with a WSGI middleware, created as `middleware_factory(app, *args, **kwargs)`.
+        Middlewares run in registration order: the first one registered sees the request first.
+        """
+        self._middlewares.append((middleware_factory, args, kwargs))
+        wsgi_app = self.dispatch
+        for factory, factory_args, factory_kwargs in reversed(self._middlewares):
+            wsgi_app = factory(wsgi_app, *factory_args, **factory_kwargs)
+        self._wsgi_app = wsgi_app
+
+    def add_readiness_check(self, name: str, check: ReadinessCheck) -> None:
+        # /readyz answers 503 while a check returns a falsy value or raises
+        self.readiness.add_check(name, check)
 
     def add_app(self, path_prefix: str, app: App):
-        # Ensure the root application is always checked last to handle overlapping paths
-        if path_prefix == '/':
-            self.apps[path_prefix] = app
-        else:
-            self.apps = {path_prefix: app, **self.apps}
+        # Mounts are matched segment by segment and the longest prefix wins, so '/admin' never captures
+        # '/administrator' and the registration order does not matter
+        segments = [segment for segment in path_prefix.split('/') if segment]
+        node = self._mounts
+        for segment in segments:
+            node = node.children.setdefault(segment, _MountNode())
+        node.app = app
+        app.script_name = ''.join(f'/{segment}' for segment in segments)
+        self.apps[app.script_name or '/'] = app
+
+    # Returns the app mounted at the longest prefix of the path, and the number of segments of that prefix
+    def _find_mount(self, path: str) -> Tuple[Optional[App], int]:
+        node = self._mounts
+        app, depth = node.app, 0
+        for index, segment in enumerate(path.split('/')[1:], start=1):
+            node = node.children.get(segment)
+            if node is None:
+                break
+            if node.app is not None:
+                app, depth = node.app, index
+        return app, depth
 
     def __call__(self, environ: Dict[str, Any], start_response: StartResponseType) -> Iterable[bytes]:
+        return self._wsgi_app(environ, start_response)
+
+    # Routes the request to the mounted app, once every Dispatcher middleware has let it through
+    def dispatch(self, environ: Dict[str, Any], start_response: StartResponseType) -> Iterable[bytes]:
         path = environ.get('PATH_INFO', '')
 
-        # Handle /favicon.ico request
-        if path == '/favicon.ico':
-            response = Response(status='204 No Content')  # TODO serve an actual favicon file
-            return response(environ, start_response)
-
-        for prefix, app in self.apps.items():
-            prefix: str
-            app: App
-            if path.startswith(prefix):
-                # print(f"Setting context for app: {app.name}")
-                app.context.set_current_app_name(app.name)
-                try:
-                    return app(environ, start_response)
-                finally:
-                    # print("Resetting Current app Context name to None")
-                    app.context.set_current_app_name(None)
-        response = Response(status='404 Not Found', body=[b'Not Found'])
-        return response(environ, start_response)
+        fixed_route = self._fixed_routes.get(path)
+        if fixed_route is not None:
+            return fixed_route(environ, start_response)
+
+        app, depth = self._find_mount(path)
+        if app is None:
+            return NOT_FOUND(environ, start_response)
+
+        # The mounted app sees its mount point in SCRIPT_NAME and only the rest of the path in PATH_INFO
+        if depth:
+            script_name = '/'.join(path.split('/', depth + 1)[:depth + 1])
+            environ['SCRIPT_NAME'] = environ.get('SCRIPT_NAME', '') + script_name
+            environ['PATH_INFO'] = path[len(script_name):]
+
+        # The app carries itself on its RequestContext, nothing needs to be set globally here
+        return app(environ, start_response)
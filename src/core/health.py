@@ -0,0 +1,64 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.core.prebuilt_response import PrebuiltResponse
+from src.http import json_codec
+from src.logger.logger import get_logger
+
+logger = get_logger(__name__)
+
+StartResponseType = Callable[[str, List[Tuple[str, str]], Any], None]
+# A readiness check returns a falsy value (or raises) when the instance cannot serve traffic
+ReadinessCheck = Callable[[], Any]
+
+HEALTHY = PrebuiltResponse('200 OK', [('Content-type', 'text/plain'), ('Cache-Control', 'no-store')], b'ok')
+
+
+class ReadinessProbe:
+    """
+    Answers readiness probes from the outcome of the registered checks. Probes arrive several times per second,
+    so the checks run at most once per `cache_ttl` seconds and the response is prebuilt from their results.
+    """
+
+    def __init__(self, cache_ttl: float = 1.0):
+        self.cache_ttl = cache_ttl
+        self.checks: Dict[str, ReadinessCheck] = {}
+        self._lock = threading.Lock()
+        # (monotonic expiry time, response)
+        self._cached: Optional[Tuple[float, PrebuiltResponse]] = None
+
+    def add_check(self, name: str, check: ReadinessCheck) -> None:
+        self.checks[name] = check
+        self._cached = None
+
+    def __call__(self, environ: Dict[str, Any], start_response: StartResponseType) -> Iterable[bytes]:
+        return self.response()(environ, start_response)
+
+    def response(self) -> PrebuiltResponse:
+        cached = self._cached
+        if cached is None or cached[0] <= time.monotonic():
+            # Concurrent probes wait for the one running the checks instead of running them again
+            with self._lock:
+                cached = self._cached
+                if cached is None or cached[0] <= time.monotonic():
+                    cached = self._cached = (time.monotonic() + self.cache_ttl, self._run_checks())
+        return cached[1]
+
+    def _run_checks(self) -> PrebuiltResponse:
+        results = {}
+        for name, check in self.checks.items():
+            try:
+                results[name] = 'ok' if check() else 'failed'
+            except Exception as e:
+                logger.warning("Readiness check failed", check=name, error=e)
+                results[name] = 'failed'
+
+        ready = all(result == 'ok' for result in results.values())
+        body = json_codec.dumps({'status': 'ready' if ready else 'not ready', 'checks': results})
+        return PrebuiltResponse(200 if ready else 503, [('Content-type', 'application/json'), ('Cache-Control', 'no-store')], body)
+
+
+def background_worker_check(worker, max_queue_depth: int = 100) -> ReadinessCheck:
+    # Ready while the worker thread is running and its backlog stays under max_queue_depth
+    return lambda: worker.thread.is_alive() and worker.queue_depth <= max_queue_depth
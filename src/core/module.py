@@ -29,24 +29,25 @@ class Module:
 
     def use_middleware(self, middleware_cls: Type[Middleware], *args: Any, **kwargs: Any) -> None:
         middleware_instance = middleware_cls(*args, **kwargs)
-        self.middlewares.append(middleware_instance)
+        # The app is updated first, so a frozen app rejects the change before the module records it
         self.app.use_middleware(lambda: middleware_instance)
+        self.middlewares.append(middleware_instance)
 
     def before_request(self, hook: Callable) -> None:
-        self.hooks.add_before_request(hook)
         self.app.before_request(hook)
+        self.hooks.add_before_request(hook)
 
     def after_request(self, hook: Callable) -> None:
-        self.hooks.add_after_request(hook)
         self.app.after_request(hook)
+        self.hooks.add_after_request(hook)
 
     def teardown_request(self, hook: Callable) -> None:
-        self.hooks.add_teardown_request(hook)
         self.app.teardown_request(hook)
+        self.hooks.add_teardown_request(hook)
 
     def before_first_request(self, hook: Callable) -> None:
-        self.hooks.add_before_first_request(hook)
         self.app.before_first_request(hook)
+        self.hooks.add_before_first_request(hook)
 
     def register_routes(self, register_func: Callable[..., None], orm: ORMInterface = None) -> None:
         if orm:
@@ -0,0 +1,73 @@
+import hashlib
+import mimetypes
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Union
+
+from src.core.response import Response
+from src.http.headers import etag_matches
+from src.http.status import parse_status
+
+StartResponseType = Callable[[str, List[Tuple[str, str]], Any], None]
+
+
+class PrebuiltResponse:
+    """
+    An immutable response whose status line, headers and body bytes are built once and reused across requests.
+    It is a WSGI application: the Dispatcher returns it directly. Inside an App, where middlewares and hooks
+    mutate responses, use `to_response()` to get a mutable copy.
+    """
+    __slots__ = ('status', 'status_code', 'headers', 'body', '_wsgi_headers', '_wsgi_body')
+
+    def __init__(self, status: Union[int, str], headers: Iterable[Tuple[str, str]] = (), body: bytes = b'') -> None:
+        set_attribute = super().__setattr__
+        status_code, status = parse_status(status)
+        set_attribute('status', status)
+        set_attribute('status_code', status_code)
+        set_attribute('headers', tuple(headers))
+        set_attribute('body', body)
+        # The body cannot change, so the Content-Length is part of the prebuilt header list
+        # (bodyless 204 and 304 responses must not announce one)
+        content_length = (('Content-Length', str(len(body))),) if body else ()
+        set_attribute('_wsgi_headers', self.headers + content_length)
+        set_attribute('_wsgi_body', (body,) if body else ())
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __call__(self, environ: Dict[str, Any], start_response: StartResponseType) -> Iterable[bytes]:
+        # WSGI servers may add headers to the list they are given, so each request gets its own list
+        start_response(self.status, list(self._wsgi_headers))
+        return self._wsgi_body
+
+    def to_response(self) -> Response:
+        return Response(body=[self.body], status=self.status, headers=list(self.headers))
+
+
+NO_CONTENT = PrebuiltResponse('204 No Content')
+BAD_REQUEST = PrebuiltResponse('400 Bad Request', [('Content-type', 'text/plain')], b'Bad Request')
+NOT_FOUND = PrebuiltResponse('404 Not Found', [('Content-type', 'text/plain')], b'Not Found')
+REQUEST_ENTITY_TOO_LARGE = PrebuiltResponse('413 Request Entity Too Large', [('Content-type', 'text/plain')],
+                                            b'Request Entity Too Large')
+INTERNAL_SERVER_ERROR = PrebuiltResponse('500 Internal Server Error', [('Content-type', 'text/plain')],
+                                         b'Internal Server Error')
+
+
+class FileResponse:
+    """
+    Serves a small file (e.g. a favicon) from memory. The file is read once; its ETag lets clients
+    revalidate with If-None-Match and get a bodyless 304 Not Modified.
+    """
+
+    def __init__(self, file_path: str, max_age: int = 86400) -> None:
+        with open(file_path, 'rb') as file:
+            body = file.read()
+        self.etag = f'"{hashlib.sha1(body).hexdigest()}"'
+        content_type = mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
+        cache_headers = [('ETag', self.etag), ('Cache-Control', f'public, max-age={max_age}')]
+        self.ok = PrebuiltResponse('200 OK', [('Content-type', content_type)] + cache_headers, body)
+        self.not_modified = PrebuiltResponse('304 Not Modified', cache_headers)
+
+    def __call__(self, environ: Dict[str, Any], start_response: StartResponseType) -> Iterable[bytes]:
+        if_none_match = environ.get('HTTP_IF_NONE_MATCH')
+        if if_none_match and etag_matches(if_none_match, self.etag):
+            return self.not_modified(environ, start_response)
+        return self.ok(environ, start_response)
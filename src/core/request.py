@@ -1,50 +1,99 @@
-from urllib.parse import parse_qs
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, IO, Iterator, Optional, Union
 
+from src.core.request_body import DEFAULT_CHUNK_SIZE, DEFAULT_SPOOL_THRESHOLD, RequestBody
+from src.http import json_codec
+from src.http.headers import EnvironHeaders
+from src.http.multidict import MultiDict, parse_params
 from src.session.session import Session
 
+# Marks a cached value that has not been computed yet, where None is a valid value
+_NOT_PARSED = object()
+
 
 class Request:
-    def __init__(self, environ: Dict[str, Any]) -> None:
+    # Allocated for every request: slots keep instances compact, and every attribute is declared here
+    __slots__ = ('environ', '_session', 'max_content_length', 'spool_threshold', 'session_id_to_set', '_body',
+                 '_headers', '_args', '_query_params', '_cookies', '_json')
+
+    def __init__(self, environ: Dict[str, Any], max_content_length: Optional[int] = None,
+                 spool_threshold: int = DEFAULT_SPOOL_THRESHOLD) -> None:
         self.environ: Dict[str, Any] = environ
         self._session: Optional[Session] = None  # Placeholder for session
+        self.max_content_length = max_content_length
+        self.spool_threshold = spool_threshold
+        # Set-Cookie value of a new session id, set by the SessionMiddleware
+        self.session_id_to_set: Optional[str] = None
+        self._body: Optional[RequestBody] = None
+        # Parsed lazily, at most once per request
+        self._headers: Optional[EnvironHeaders] = None
+        self._args: Optional[MultiDict] = None
+        self._query_params: Optional[Dict[str, list[str]]] = None
+        self._cookies: Optional[Dict[str, str]] = None
+        self._json: Any = _NOT_PARSED
 
     @property
     def method(self) -> str:
         return self.environ['REQUEST_METHOD']
 
+    # An app mounted by the Dispatcher receives an empty PATH_INFO for its mount point itself
     @property
     def path(self) -> str:
-        return self.environ['PATH_INFO']
+        return self.environ.get('PATH_INFO') or '/'
+
+    @property
+    def script_name(self) -> str:
+        return self.environ.get('SCRIPT_NAME', '')
 
     @property
     def query_string(self) -> str:
         return self.environ['QUERY_STRING']
 
+    # Case-insensitive: headers['Content-Type'] and headers['content-type'] are the same header
     @property
-    def headers(self) -> Dict[str, str]:
-        headers = {}
-        for key, value in self.environ.items():
-            if key.startswith('HTTP_'):
-                headers[key[5:].replace('_', '-').lower()] = value
-            elif key in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
-                # First letter of each work capitalized, e.g. 'content-type' becomes 'Content-Type'.
-                headers[key.replace('_', '-').lower()] = value
-            else:
-                # Include other potential headers without modification
-                headers[key.replace('_', '-').lower()] = value
-
-        return headers
+    def headers(self) -> EnvironHeaders:
+        if self._headers is None:
+            self._headers = EnvironHeaders(self.environ)
+        return self._headers
 
+    # None when the request does not announce its length (or announces an invalid one)
     @property
-    def body(self) -> bytes:
+    def content_length(self) -> Optional[int]:
         try:
-            length = int(self.environ.get('CONTENT_LENGTH', '0'))
+            length = int(self.environ.get('CONTENT_LENGTH') or '')
         except (ValueError, TypeError):
-            length = 0
-        if length > 0:
-            return self.environ['wsgi.input'].read(length)
-        return b''
+            return None
+        return length if length >= 0 else None
+
+    # True when the announced length alone exceeds max_content_length, so the request can be rejected unread
+    @property
+    def too_large(self) -> bool:
+        length = self.content_length
+        return self.max_content_length is not None and length is not None and length > self.max_content_length
+
+    # The whole body, read at most once (RequestEntityTooLarge is raised past max_content_length)
+    @property
+    def body(self) -> bytes:
+        return self._get_body().read()
+
+    # The whole body as a file rewound to its start, kept in a temporary file when larger than spool_threshold
+    @property
+    def body_file(self) -> IO[bytes]:
+        return self._get_body().file()
+
+    # Streams the body without buffering it, unless it has already been read
+    def iter_body(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        return self._get_body().iter_chunks(chunk_size)
+
+    def _get_body(self) -> RequestBody:
+        if self._body is None:
+            self._body = RequestBody(self.environ.get('wsgi.input'), self.content_length, self.max_content_length,
+                                     self.spool_threshold, self.environ.get('wsgi.input_terminated', False))
+        return self._body
+
+    # Releases the temporary file a large body may have been spooled to
+    def close(self) -> None:
+        if self._body is not None:
+            self._body.close()
 
     @property
     def wsgi_version(self) -> Optional[tuple]:
@@ -100,32 +149,51 @@ class Request:
     def remote_host(self) -> Optional[str]:
         return self.environ.get('REMOTE_HOST')
 
+    # The query string parameters: args['sort'] is the first value, args.getlist('sort') all of them
+    # (TooManyParameters is raised past MAX_PARAMS parameters)
+    @property
+    def args(self) -> MultiDict:
+        if self._args is None:
+            self._args = parse_params(self.environ.get('QUERY_STRING', ''))
+        return self._args
+
     # E.g. handling http://example.com/search?query=python&sort=asc&sort=desc&page=1
     # Returns {'query': ['python'], 'sort': ['asc', 'desc'], 'page': ['1']}
     def get_query_params(self) -> Dict[str, list[str]]:
-        return parse_qs(self.query_string)
+        if self._query_params is None:
+            self._query_params = self.args.lists()
+        return self._query_params
 
     def get_json(self) -> Optional[Union[Dict[str, Any], list]]:
-        import json
-        if 'application/json' in self.headers.get('content-type', ''):
-            return json.loads(self.body)
-        return None
+        if self._json is _NOT_PARSED:
+            if 'application/json' in self.headers.get('content-type', ''):
+                self._json = json_codec.loads(self.body)
+            else:
+                self._json = None
+        return self._json
+
+    # E.g. 'Cookie: session_id=abc; theme=dark' returns {'session_id': 'abc', 'theme': 'dark'}
+    @property
+    def cookies(self) -> Dict[str, str]:
+        if self._cookies is None:
+            cookies = {}
+            for cookie in self.environ.get('HTTP_COOKIE', '').split(';'):
+                name, separator, value = cookie.partition('=')
+                if separator:
+                    cookies[name.strip()] = value.strip()
+            self._cookies = cookies
+        return self._cookies
 
     @property
     def all_headers(self) -> Dict[str, str]:
-        headers = self.headers.copy()
+        headers = dict(self.headers)
         for key in self.environ:
             if key not in headers and not key.startswith('wsgi.') and not key.startswith('HTTP_'):
                 headers[key.replace('_', '-').title()] = self.environ[key]
         return headers
 
     def extract_session_id(self) -> Optional[str]:
-        cookies = self.environ.get('HTTP_COOKIE', '')
-        session_id = None
-        for cookie in cookies.split(';'):
-            if cookie.strip().startswith('session_id='):
-                session_id = cookie.split('=')[1].strip()
-        return session_id
+        return self.cookies.get('session_id')
 
     @property
     def session(self) -> Optional[Session]:
@@ -0,0 +1,85 @@
+from tempfile import SpooledTemporaryFile
+from typing import Any, IO, Iterator, Optional
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+# Bodies larger than this are buffered in a temporary file instead of in memory
+DEFAULT_SPOOL_THRESHOLD = 1024 * 1024
+
+
+class RequestEntityTooLarge(Exception):
+    pass
+
+
+class RequestBody:
+    """
+    Reads the body of a request from `wsgi.input`, which can only be read once.
+    Either stream it with `iter_chunks` (nothing is buffered, so it cannot be read again afterwards), or buffer it
+    with `file`/`read`: in memory up to `spool_threshold` bytes, in a temporary file beyond.
+    Reading more than `max_content_length` bytes raises RequestEntityTooLarge.
+    """
+
+    def __init__(self, stream: Any, content_length: Optional[int], max_content_length: Optional[int] = None,
+                 spool_threshold: int = DEFAULT_SPOOL_THRESHOLD, input_terminated: bool = False) -> None:
+        self._stream = stream
+        # Without a Content-Length the body can only be read if the server terminates the input stream (PEP 3333)
+        self._remaining: Optional[int] = content_length if content_length is not None else (
+            None if input_terminated else 0)
+        self.max_content_length = max_content_length
+        self.spool_threshold = spool_threshold
+        self._buffer: Optional[IO[bytes]] = None
+        self._bytes: Optional[bytes] = None
+        self._streamed = False
+
+    def iter_chunks(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        if self._buffer is not None:
+            yield from self._iter_buffer(chunk_size)
+            return
+        if self._streamed:
+            raise RuntimeError("The request body has already been streamed")
+        self._streamed = True
+        yield from self._read_stream(chunk_size)
+
+    def file(self) -> IO[bytes]:
+        # The whole body, rewound to its start
+        if self._buffer is None:
+            if self._streamed:
+                raise RuntimeError("The request body has already been streamed")
+            self._streamed = True
+            buffer = SpooledTemporaryFile(max_size=self.spool_threshold)
+            for chunk in self._read_stream(DEFAULT_CHUNK_SIZE):
+                buffer.write(chunk)
+            self._buffer = buffer
+        self._buffer.seek(0)
+        return self._buffer
+
+    def read(self) -> bytes:
+        if self._bytes is None:
+            self._bytes = self.file().read()
+        return self._bytes
+
+    def close(self) -> None:
+        if self._buffer is not None:
+            self._buffer.close()
+
+    def _iter_buffer(self, chunk_size: int) -> Iterator[bytes]:
+        buffer = self.file()
+        chunk = buffer.read(chunk_size)
+        while chunk:
+            yield chunk
+            chunk = buffer.read(chunk_size)
+
+    def _read_stream(self, chunk_size: int) -> Iterator[bytes]:
+        remaining = self._remaining
+        if remaining is not None and self.max_content_length is not None and remaining > self.max_content_length:
+            raise RequestEntityTooLarge()
+
+        read = 0
+        while remaining is None or read < remaining:
+            size = chunk_size if remaining is None else min(chunk_size, remaining - read)
+            chunk = self._stream.read(size)
+            if not chunk:
+                break
+            read += len(chunk)
+            if self.max_content_length is not None and read > self.max_content_length:
+                raise RequestEntityTooLarge()
+            yield chunk
@@ -1,24 +1,36 @@
-from typing import Any, Dict, Optional, Type, TYPE_CHECKING
-from urllib.parse import parse_qs
+from typing import Any, Dict, Iterator, Optional, Type, TYPE_CHECKING
 
 from src.core.request import Request
+from src.core.request_body import DEFAULT_CHUNK_SIZE
 from src.core.session_context import SessionContext
+from src.http.headers import EnvironHeaders
+from src.http.multidict import MultiDict, parse_params
+from src.http.multipart import MAX_MEMORY, UploadedFile, get_boundary, parse_multipart
 from src.core.app_context import AppContext
 
 if TYPE_CHECKING:
     from src.app import App
     from src.forms.form import BaseForm
+    from src.signals.signal_manager import SignalManager
 
 
 class RequestContext:
-    def __init__(self, request: Request, app_context: AppContext):
+    __slots__ = ('request', '_session_context', '_app_context', 'app', '_user', 'current_module_dir', '_form_data',
+                 '_files', 'signal_manager')
+
+    def __init__(self, request: Request, app_context: AppContext, app: Optional['App'] = None):
         self.request = request
         self._session_context: Optional[SessionContext] = None
         self._app_context = app_context
+        # The app handling the request and the directory of the module of the matched route,
+        # carried explicitly instead of being written to global state on every request
+        self.app = app
         self._user: Optional[Dict[str, Any]] = None
         self.current_module_dir: Optional[str] = None
-        self._form_data: Optional[Dict[str, str]] = None  # Cache for form data
-        self.signal_manager = None
+        self._form_data: Optional[MultiDict] = None  # Cache for form data
+        self._files: Dict[str, UploadedFile] = {}  # File parts of a multipart form, parsed with the form data
+        # Set by the ResponseTimeMiddleware so that views can emit request signals
+        self.signal_manager: Optional['SignalManager'] = None
 
     @property
     def method(self) -> str:
@@ -33,13 +45,16 @@ class RequestContext:
         return self.request.query_string
 
     @property
-    def headers(self) -> Dict[str, str]:
+    def headers(self) -> EnvironHeaders:
         return self.request.headers
 
     @property
     def body(self) -> bytes:
         return self.request.body
 
+    def iter_body(self, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+        return self.request.iter_body(chunk_size)
+
     @property
     def session_context(self) -> Optional[SessionContext]:
         return self._session_context
@@ -54,6 +69,8 @@ class RequestContext:
 
     @property
     def current_app(self) -> Optional['App']:
+        if self.app is not None:
+            return self.app
         app_name = self.app_context.get_current_app_name()
         if app_name:
             return self.app_context.get_app_instance(app_name)
@@ -61,7 +78,7 @@ class RequestContext:
 
     @property
     def current_configuration(self) -> Dict[str, Any]:
-        app_name = self.app_context.get_current_app_name()
+        app_name = self.app.name if self.app is not None else self.app_context.get_current_app_name()
         if app_name:
             return self.app_context.get_config(app_name)
         raise ValueError("No current app set in context.")
@@ -69,6 +86,10 @@ class RequestContext:
     def get_query_params(self) -> Dict[str, list[str]]:
         return self.request.get_query_params()
 
+    @property
+    def args(self) -> MultiDict:
+        return self.request.args
+
     def get_json(self) -> Dict[str, Any]:
         return self.request.get_json()
 
@@ -80,7 +101,8 @@ class RequestContext:
     def user(self, user: Dict[str, Any]) -> None:
         self._user = user
 
-    def get_form_data(self) -> Dict[str, str]:
+    # Form fields: form_data['tags'] is the first value, form_data.getlist('tags') all of them
+    def get_form_data(self) -> MultiDict:
         if self._form_data is None:
             if self.method in ("POST", "PUT", "PATCH", "DELETE"):
                 content_type = self.headers.get("Content-Type", "")
@@ -89,13 +111,19 @@ class RequestContext:
                 elif 'multipart/form-data' in content_type:
                     self._form_data = self.parse_multipart()
                 else:
-                    self._form_data = {}
+                    self._form_data = MultiDict()
         return self._form_data
 
     @property
-    def form_data(self) -> Dict[str, str]:
+    def form_data(self) -> MultiDict:
         return self.get_form_data()
 
+    # Uploaded files of a multipart/form-data request, by field name
+    @property
+    def files(self) -> Dict[str, UploadedFile]:
+        self.get_form_data()
+        return self._files
+
     def get_form(self, form_class: Type['BaseForm']):
         form_data = self.get_form_data()
         form = form_class(form_data, self)
@@ -107,11 +135,32 @@ class RequestContext:
     def set_csrf_token(self, csrf_token: str) -> None:
         self._session_context.csrf_token = csrf_token
 
-    def parse_form_urlencoded(self) -> Dict[str, str]:
-        return {k: v[0] for k, v in parse_qs(self.request.body.decode()).items()}
-
-    def parse_multipart(self) -> Dict[str, str]:
-        raise NotImplementedError("Multipart form data parsing is not implemented yet")
+    def parse_form_urlencoded(self) -> MultiDict:
+        return parse_params(self.request.body.decode())
+
+    # Streams the body through the parser: fields are kept in memory, files are spooled like large bodies.
+    # Raises MultipartError (answered 400 by the App) for malformed or oversized forms.
+    def parse_multipart(self) -> MultiDict:
+        boundary = get_boundary(self.headers.get('Content-Type', ''))
+        fields = []
+        parts = parse_multipart(self.request.iter_body(), boundary, spool_threshold=self.request.spool_threshold,
+                                max_memory=MAX_MEMORY)
+        for part in parts:
+            if part.is_file:
+                # The first file of a repeated file field wins
+                if part.name in self._files:
+                    part.value.close()
+                else:
+                    self._files[part.name] = part.value
+            else:
+                fields.append((part.name, part.value))
+        return MultiDict(fields)
+
+    # Releases the temporary files of the request body and of uploaded files
+    def close(self) -> None:
+        for uploaded_file in self._files.values():
+            uploaded_file.close()
+        self.request.close()
 
     def set_current_module_dir(self, module_dir: str) -> None:
         self.current_module_dir = module_dir
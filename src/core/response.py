@@ -1,79 +1,212 @@
-from typing import Union, Iterable, List, Tuple, Generator, Dict
+import asyncio
+import os
+from typing import Any, AsyncIterable, Callable, Dict, Generator, IO, Iterable, Iterator, List, Optional, Tuple, Union
+
+from src.http import json_codec
+from src.http.headers import Headers
+from src.http.status import parse_status
+
+DEFAULT_BLOCK_SIZE = 64 * 1024
 
 
 class Response:
-    def __init__(self, body: Union[bytes, Iterable[bytes]] = b'', status: Union[int, str] = 200,
-                 headers: List[Tuple[str, str]] = None) -> None:
+    __slots__ = ('body', '_status', '_status_code', '_headers')
+    # Whether the body is produced while it is sent (see StreamingResponse)
+    streaming = False
+
+    def __init__(self, body: Union[bytes, str, Iterable[bytes]] = b'', status: Union[int, str] = 200,
+                 headers: Union[List[Tuple[str, str]], Headers, Dict[str, str]] = None) -> None:
         if isinstance(body, str):
-            body = body.encode()
+            body = [body.encode()]
         elif isinstance(body, bytes):
             body = [body]  # Ensure body is an iterable of bytes
         self.body: Union[bytes, Iterable[bytes]] = body
-        self._status: str = self._init_status(status)
-        self.headers_dict = dict(headers) if headers else {}
+        self._status_code, self._status = parse_status(status)
+        self._headers = Headers(headers)
 
+    # Ordered (name, value) pairs with case-insensitive access by name, see Headers
     @property
-    def headers(self) -> List[Tuple[str, str]]:
-        return list(self.headers_dict.items())
+    def headers(self) -> Headers:
+        return self._headers
 
-    # Converts an integer status code to a status message
-    def _init_status(self, status: Union[int, str]) -> str:
-        if isinstance(status, int):
-            return f'{status} {self._status_message(status)}'
-        return status
+    # The same headers, for the code that accesses them as a mapping
+    @property
+    def headers_dict(self) -> Headers:
+        return self._headers
 
     def __call__(self, environ, start_response):
         # Start the WSGI response
-        start_response(self._status, self.headers)
+        start_response(self._status, self._headers.to_wsgi())
         # Return the body as an iterable
         return self
 
-    @staticmethod
-    def _status_message(status_code: int) -> str:
-        # A simple mapping of status codes to messages
-        # This should be expanded with all the relevant HTTP status codes and messages.
-        status_messages = {
-            200: "OK",
-            201: "Created",
-            204: "No Content",
-            400: "Bad Request",
-            401: "Unauthorized",
-            403: "Forbidden",
-            404: "Not Found",
-            500: "Internal Server Error",
-            502: "Bad Gateway",
-            503: "Service Unavailable",
-        }
-        return status_messages.get(status_code, "Unknown Status")
+    # The iterable handed to the WSGI server once the response has started
+    def wsgi_body(self, environ: Dict[str, Any]) -> Iterable[bytes]:
+        return self.body
 
     # Sets a header, replacing it if it already exists
     def set_header(self, name: str, value: str) -> None:
-        self.headers_dict[name] = value
+        self._headers[name] = value
 
-    def __iter__(self) -> Generator[bytes, None, None]:
-        # Convert the body to an iterable
+    # Adds a header, keeping the existing values of the same name (e.g. several Set-Cookie headers)
+    def add_header(self, name: str, value: str) -> None:
+        self._headers.add(name, value)
+
+    # The chunks are not checked here, an App in debug mode validates them (see validate_body)
+    def __iter__(self) -> Iterator[bytes]:
         if isinstance(self.body, bytes):
-            yield self.body
-        else:
-            for chunk in self.body:
-                if not isinstance(chunk, bytes):
-                    raise TypeError('%r is not a byte' % chunk)
-                yield chunk
+            return iter((self.body,))
+        return iter(self.body)
 
     @property
     def status(self) -> str:
         return self._status
 
+    # An int code is turned into its status line from the precomputed table, see src.http.status
     @status.setter
     def status(self, value: Union[int, str]) -> None:
-        self._status = self._init_status(value)
+        self._status_code, self._status = parse_status(value)
 
-    # Extracts the status code from the status message
     @property
     def status_code(self) -> int:
-        return int(self.status.split()[0])
+        return self._status_code
 
-    # Extracts the status message from the status
+    # The reason phrase of the status line
     @property
     def status_message(self) -> str:
-        return " ".join(self.status.split()[1:])
+        return self._status.partition(' ')[2]
+
+
+class JSONResponse(Response):
+    __slots__ = ()
+
+    # Serializes the data straight to bytes with the configured JSON codec
+    def __init__(self, data: Any, status: Union[int, str] = 200, headers: List[Tuple[str, str]] = None) -> None:
+        super().__init__(body=[json_codec.dumps(data)], status=status, headers=headers)
+        self.headers_dict.setdefault('Content-Type', 'application/json')
+
+
+class StreamingResponse(Response):
+    """
+    A response whose body is sent while it is produced, with constant memory: a generator (or any iterable) of
+    bytes, a binary file object, or an async iterator of bytes.
+    Files are sent with the server's `wsgi.file_wrapper` (e.g. sendfile) when it provides one, unless a
+    middleware transformed the body. The body is closed once sent, or when the server closes the response.
+    """
+    __slots__ = ('file', 'block_size')
+    streaming = True
+
+    def __init__(self, body: Union[Iterable[bytes], IO[bytes], AsyncIterable[bytes]], status: Union[int, str] = 200,
+                 headers: List[Tuple[str, str]] = None, block_size: int = DEFAULT_BLOCK_SIZE) -> None:
+        self.file: Optional[IO[bytes]] = None
+        self.block_size = block_size
+        if hasattr(body, 'read'):
+            self.file = body
+            chunks = iter(lambda: body.read(block_size), b'')
+        elif hasattr(body, '__aiter__'):
+            chunks = _iterate_async(body)
+        else:
+            chunks = body
+        super().__init__(body=chunks, status=status, headers=headers)
+        if self.file is not None and 'Content-Length' not in self.headers_dict:
+            size = _remaining_size(self.file)
+            if size is not None:
+                self.headers_dict['Content-Length'] = str(size)
+
+    # Applies func to every chunk as it is sent. The body is no longer a plain file, so sendfile is not used.
+    def transform(self, func: Callable[[bytes], bytes]) -> None:
+        self.body = map(func, self.body)
+        self.file = None
+        self.headers_dict.pop('Content-Length', None)
+
+    def __call__(self, environ, start_response):
+        start_response(self._status, self._headers.to_wsgi())
+        return self.wsgi_body(environ)
+
+    def wsgi_body(self, environ: Dict[str, Any]) -> Iterable[bytes]:
+        file_wrapper = environ.get('wsgi.file_wrapper')
+        if self.file is not None and file_wrapper is not None:
+            return file_wrapper(self.file, self.block_size)
+        return _ClosingIterator(self.body, self.file)
+
+    def __iter__(self) -> Generator[bytes, None, None]:
+        yield from self.wsgi_body({})
+
+
+class _ClosingIterator:
+    # Lets the WSGI server close the generator or file of a streaming response once it is sent (PEP 3333)
+    __slots__ = ('_iterator', '_closables')
+
+    def __init__(self, chunks: Iterable[bytes], file: Optional[IO[bytes]]) -> None:
+        self._iterator: Iterator[bytes] = iter(chunks)
+        self._closables = [closable for closable in (chunks, file) if hasattr(closable, 'close')]
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self
+
+    def __next__(self) -> bytes:
+        return next(self._iterator)
+
+    def close(self) -> None:
+        for closable in self._closables:
+            closable.close()
+
+
+class _ValidatingIterator:
+    # Checks the chunks of a body as they are sent, and still lets the server close it
+    __slots__ = ('_body', '_iterator')
+
+    def __init__(self, body: Iterable[bytes]) -> None:
+        self._body = body
+        self._iterator: Iterator[bytes] = iter(body)
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self
+
+    def __next__(self) -> bytes:
+        chunk = next(self._iterator)
+        if not isinstance(chunk, bytes):
+            raise TypeError('%r is not a byte' % chunk)
+        return chunk
+
+    def close(self) -> None:
+        if hasattr(self._body, 'close'):
+            self._body.close()
+
+
+def validate_body(body: Iterable[bytes]) -> Iterable[bytes]:
+    """
+    Debug mode check of a WSGI body: every chunk must be bytes, or a TypeError is raised. Lists are checked at once,
+    generators and iterators as they are sent.
+    """
+    if isinstance(body, (list, tuple)):
+        for chunk in body:
+            if not isinstance(chunk, bytes):
+                raise TypeError('%r is not a byte' % chunk)
+        return body
+    if isinstance(body, (bytes, str)):
+        raise TypeError(f'The body must be an iterable of bytes, not {type(body).__name__}')
+    return _ValidatingIterator(body)
+
+
+def _iterate_async(chunks: AsyncIterable[bytes]) -> Generator[bytes, None, None]:
+    # WSGI servers iterate synchronously, so the async iterator is driven by a private event loop
+    loop = asyncio.new_event_loop()
+    iterator = chunks.__aiter__()
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(iterator.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        if hasattr(iterator, 'aclose'):
+            loop.run_until_complete(iterator.aclose())
+        loop.close()
+
+
+def _remaining_size(file: IO[bytes]) -> Optional[int]:
+    try:
+        return os.fstat(file.fileno()).st_size - file.tell()
+    except (AttributeError, OSError, ValueError):
+        return None
@@ -4,6 +4,8 @@ from src.session.session import Session
 
 
 class SessionContext:
+    __slots__ = ('_session', '_csrf_token')
+
     def __init__(self, session: Optional[Session] = None):
         self._session = session
         self._csrf_token = None
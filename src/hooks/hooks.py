@@ -20,3 +20,10 @@ class Hooks:
 
     def add_before_first_request(self, hook: Callable):
         self.before_first_request_hooks.append(hook)
+
+    # Turns the hook lists into tuples once registration is over
+    def freeze(self):
+        self.before_request_hooks = tuple(self.before_request_hooks)
+        self.after_request_hooks = tuple(self.after_request_hooks)
+        self.teardown_request_hooks = tuple(self.teardown_request_hooks)
+        self.before_first_request_hooks = tuple(self.before_first_request_hooks)
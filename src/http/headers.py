@@ -0,0 +1,170 @@
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Tuple, Union
+
+
+class EnvironHeaders(Mapping[str, str]):
+    """
+    The HTTP headers of a request, parsed once from the WSGI environ.
+    Only real headers are included (the HTTP_* variables plus CONTENT_TYPE and CONTENT_LENGTH), names are
+    case-insensitive ('Content-Type', 'content-type') and iterate in lowercase, and the mapping is immutable.
+    """
+    __slots__ = ('_headers',)
+
+    def __init__(self, environ: Dict[str, Any]) -> None:
+        headers = {}
+        for key, value in environ.items():
+            if key.startswith('HTTP_'):
+                headers[key[5:].replace('_', '-').lower()] = value
+            elif key in ('CONTENT_TYPE', 'CONTENT_LENGTH') and value:
+                headers[key.replace('_', '-').lower()] = value
+        self._headers: Dict[str, str] = headers
+
+    def __getitem__(self, name: str) -> str:
+        return self._headers[name.lower()]
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self._headers.get(name.lower(), default)
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and name.lower() in self._headers
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._headers)
+
+    def __len__(self) -> int:
+        return len(self._headers)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self._headers!r})'
+
+
+class Headers:
+    """
+    The headers of a response: an ordered list of (name, value) pairs, where a name can repeat (e.g. Set-Cookie),
+    with case-insensitive access by name. It behaves like the list of pairs handed to start_response
+    (iteration, indexing, `append`, comparison with a list) and like a mapping of names to their first value
+    (`headers['Content-Type']`, `get`, `setdefault`, `pop`, `in`). Setting a name replaces all its values, `add`
+    appends one more.
+    """
+    __slots__ = ('_items', '_names')
+
+    def __init__(self, headers: Union[Iterable[Tuple[str, str]], Mapping[str, str], None] = None) -> None:
+        if isinstance(headers, Mapping):
+            headers = headers.items()
+        self._items: List[Tuple[str, str]] = list(headers) if headers else []
+        # Lowercased names, in the same order as the pairs
+        self._names: List[str] = [name.lower() for name, _ in self._items]
+
+    def add(self, name: str, value: str) -> None:
+        self._items.append((name, value))
+        self._names.append(name.lower())
+
+    def append(self, header: Tuple[str, str]) -> None:
+        self.add(*header)
+
+    def extend(self, headers: Iterable[Tuple[str, str]]) -> None:
+        for name, value in headers:
+            self.add(name, value)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        try:
+            return self._items[self._names.index(name.lower())][1]
+        except ValueError:
+            return default
+
+    def getlist(self, name: str) -> List[str]:
+        key = name.lower()
+        return [value for (_, value), header_key in zip(self._items, self._names) if header_key == key]
+
+    def setdefault(self, name: str, value: str) -> str:
+        existing = self.get(name)
+        if existing is None:
+            self.add(name, value)
+            return value
+        return existing
+
+    def pop(self, name: str, *default: Any) -> Any:
+        value = self.get(name, _MISSING)
+        if value is _MISSING:
+            if default:
+                return default[0]
+            raise KeyError(name)
+        del self[name]
+        return value
+
+    def __getitem__(self, key: Union[str, int, slice]) -> Any:
+        if not isinstance(key, str):
+            return self._items[key]
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, name: str, value: str) -> None:
+        # The first occurrence keeps its position, the others are removed
+        key = name.lower()
+        try:
+            index = self._names.index(key)
+        except ValueError:
+            self.add(name, value)
+            return
+        self._items[index] = (name, value)
+        if self._names.count(key) > 1:
+            self._remove(key, start=index + 1)
+
+    def __delitem__(self, name: str) -> None:
+        key = name.lower()
+        if key not in self._names:
+            raise KeyError(name)
+        self._remove(key)
+
+    def _remove(self, key: str, start: int = 0) -> None:
+        kept = [(item, name) for index, (item, name) in enumerate(zip(self._items, self._names))
+                if index < start or name != key]
+        self._items = [item for item, _ in kept]
+        self._names = [name for _, name in kept]
+
+    def __contains__(self, item: object) -> bool:
+        # A name (case-insensitive) or a (name, value) pair
+        if isinstance(item, str):
+            return item.lower() in self._names
+        return item in self._items
+
+    def __iter__(self) -> Iterator[Tuple[str, str]]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Headers):
+            return self._items == other._items
+        if isinstance(other, list):
+            return self._items == other
+        return NotImplemented
+
+    # dict(headers) maps every name to its first value
+    def keys(self) -> List[str]:
+        return list(dict.fromkeys(name for name, _ in self._items))
+
+    def items(self) -> List[Tuple[str, str]]:
+        return list(self._items)
+
+    # The list handed to start_response, built once when the response starts
+    def to_wsgi(self) -> List[Tuple[str, str]]:
+        return list(self._items)
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self._items!r})'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    # If-None-Match is a comma separated list of ETags, or '*'. It uses the weak comparison: W/"x" matches "x".
+    etag = etag.removeprefix('W/')
+    for candidate in if_none_match.split(','):
+        candidate = candidate.strip()
+        if candidate == '*' or candidate.removeprefix('W/') == etag:
+            return True
+    return False
+
+
+_MISSING = object()
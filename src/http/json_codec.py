@@ -0,0 +1,85 @@
+import json
+from typing import Any, Dict, List, Type, Union
+
+from src.config import config
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+
+class JSONCodec:
+    """
+    Encodes and decodes the JSON of requests and responses. `dumps` returns bytes, ready to be sent, and
+    `loads` accepts the raw request body. Decoding errors are ValueErrors, whatever the backend.
+    """
+    name = 'json'
+
+    def dumps(self, data: Any) -> bytes:
+        return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    # orjson serializes straight to bytes
+    name = 'orjson'
+
+    def dumps(self, data: Any) -> bytes:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return orjson.loads(data)
+
+
+class UjsonCodec(JSONCodec):
+    name = 'ujson'
+
+    def dumps(self, data: Any) -> bytes:
+        return ujson.dumps(data, ensure_ascii=False).encode('utf-8')
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return ujson.loads(data)
+
+
+# Codecs by name, fastest first, and the module each one needs (None when it is not installed)
+JSON_CODECS: Dict[str, Type[JSONCodec]] = {'orjson': OrjsonCodec, 'ujson': UjsonCodec, 'json': JSONCodec}
+_BACKENDS = {'orjson': orjson, 'ujson': ujson, 'json': json}
+
+
+def available_codecs() -> List[str]:
+    return [name for name in JSON_CODECS if _BACKENDS[name] is not None]
+
+
+def create_codec(name: str = 'auto') -> JSONCodec:
+    # 'auto' picks the fastest installed backend: orjson, then ujson, then the standard library
+    if name == 'auto':
+        name = available_codecs()[0]
+    if name not in JSON_CODECS:
+        raise ValueError(f"Unknown JSON codec: {name}")
+    if _BACKENDS[name] is None:
+        raise ValueError(f"JSON codec '{name}' is not installed")
+    return JSON_CODECS[name]()
+
+
+codec: JSONCodec = create_codec(config.JSON_CODEC)
+
+
+def set_codec(name: str) -> None:
+    global codec
+    codec = create_codec(name)
+
+
+def dumps(data: Any) -> bytes:
+    return codec.dumps(data)
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    return codec.loads(data)
@@ -1,7 +1,7 @@
-import json
-from typing import Union, Dict, Any
+from typing import Union, Dict, Any, List
 
 from src.core.response import Response
+from src.http import json_codec
 from src.http.response_builder import ResponseBuilder
 
 
@@ -19,9 +19,9 @@ class JSONResponseBuilder(ResponseBuilder):
         self._response.set_header(name, value)
         return self
 
-    def set_body(self, body: Union[Dict[str, Any], str, bytes]) -> 'JSONResponseBuilder':
-        if isinstance(body, dict):
-            body = json.dumps(body).encode('utf-8')
+    def set_body(self, body: Union[Dict[str, Any], List[Any], str, bytes]) -> 'JSONResponseBuilder':
+        if isinstance(body, (dict, list)):
+            body = json_codec.dumps(body)
         elif isinstance(body, str):
             body = body.encode('utf-8')
         elif isinstance(body, bytes):
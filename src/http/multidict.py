@@ -0,0 +1,96 @@
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+from urllib.parse import unquote_plus
+
+# Parameters parsed from one query string or form at most, a bound on hash-flooding exposure
+MAX_PARAMS = 1000
+
+TRUE_VALUES = frozenset(('1', 'true', 'yes', 'on'))
+FALSE_VALUES = frozenset(('0', 'false', 'no', 'off', ''))
+
+
+class TooManyParameters(ValueError):
+    pass
+
+
+class MultiDict(Mapping[str, str]):
+    """
+    Immutable parameters of a query string or form, where a name can have several values.
+    `params['sort']` and `params.get('sort')` return the first value, `params.getlist('sort')` all of them, and
+    `get_int`/`get_bool` convert the first value, falling back to the default when it is missing or invalid.
+    """
+    __slots__ = ('_lists',)
+
+    def __init__(self, pairs: Iterable[Tuple[str, str]] = ()) -> None:
+        lists: Dict[str, List[str]] = {}
+        for name, value in pairs:
+            values = lists.get(name)
+            if values is None:
+                lists[name] = [value]
+            else:
+                values.append(value)
+        self._lists = lists
+
+    def __getitem__(self, name: str) -> str:
+        return self._lists[name][0]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._lists)
+
+    def __len__(self) -> int:
+        return len(self._lists)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._lists
+
+    def get(self, name: str, default: Any = None) -> Any:
+        values = self._lists.get(name)
+        return values[0] if values else default
+
+    def getlist(self, name: str) -> List[str]:
+        return list(self._lists.get(name, ()))
+
+    def get_int(self, name: str, default: Optional[int] = None) -> Optional[int]:
+        try:
+            return int(self._lists[name][0])
+        except (KeyError, ValueError):
+            return default
+
+    def get_bool(self, name: str, default: bool = False) -> bool:
+        values = self._lists.get(name)
+        if not values:
+            return default
+        value = values[0].lower()
+        if value in TRUE_VALUES:
+            return True
+        if value in FALSE_VALUES:
+            return False
+        return default
+
+    # Every value of every name, e.g. {'sort': ['asc', 'desc'], 'page': ['1']}
+    def lists(self) -> Dict[str, List[str]]:
+        return {name: list(values) for name, values in self._lists.items()}
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self._lists!r})'
+
+
+def parse_params(data: str, max_params: int = MAX_PARAMS, keep_blank_values: bool = False) -> MultiDict:
+    """
+    Parses 'a=1&b=2&b=3' (a query string or an urlencoded form) like `parse_qs`, but only unquotes the names and
+    values that need it, and raises TooManyParameters past `max_params` parameters.
+    """
+    pairs = []
+    if not data:
+        return MultiDict(pairs)
+    for field in data.split('&'):
+        name, _, value = field.partition('=')
+        if not field or (not value and not keep_blank_values):
+            continue
+        if len(pairs) == max_params:
+            raise TooManyParameters(f"More than {max_params} parameters")
+        if '%' in name or '+' in name:
+            name = unquote_plus(name)
+        if '%' in value or '+' in value:
+            value = unquote_plus(value)
+        pairs.append((name, value))
+    return MultiDict(pairs)
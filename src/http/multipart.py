@@ -0,0 +1,206 @@
+import re
+import shutil
+from tempfile import SpooledTemporaryFile
+from typing import Dict, IO, Iterable, Iterator, Optional, Tuple, Union
+
+from src.core.request_body import DEFAULT_SPOOL_THRESHOLD
+
+# Limits that bound the memory used to parse a request, whatever the size of the upload
+MAX_FIELD_SIZE = 1024 * 1024
+MAX_HEADER_SIZE = 16 * 1024
+MAX_PARTS = 1000
+# Bytes of all the parts kept in memory at once: the fields, and the files up to the spool threshold
+MAX_MEMORY = 8 * 1024 * 1024
+
+# 'form-data; name="file"; filename="a.txt"' parameters, quoted or not
+HEADER_PARAMETER_PATTERN = re.compile(r';\s*([\w*-]+)\s*=\s*(?:"((?:[^"\\]|\\.)*)"|([^;\s]*))')
+
+
+class MultipartError(ValueError):
+    pass
+
+
+class UploadedFile:
+    """A file part of a multipart request, kept in memory up to the spool threshold and in a temporary file beyond."""
+
+    def __init__(self, filename: str, content_type: str, spool_threshold: int = DEFAULT_SPOOL_THRESHOLD) -> None:
+        self.filename = filename
+        self.content_type = content_type
+        self.file: IO[bytes] = SpooledTemporaryFile(max_size=spool_threshold)
+        self.size = 0
+
+    def write(self, data: bytes) -> None:
+        self.file.write(data)
+        self.size += len(data)
+
+    def read(self) -> bytes:
+        self.file.seek(0)
+        return self.file.read()
+
+    def save(self, path: str) -> None:
+        self.file.seek(0)
+        with open(path, 'wb') as destination:
+            shutil.copyfileobj(self.file, destination)
+
+    def close(self) -> None:
+        self.file.close()
+
+    def __repr__(self) -> str:
+        return f'{type(self).__name__}({self.filename!r}, {self.content_type!r}, size={self.size})'
+
+
+class MultipartPart:
+    def __init__(self, headers: Dict[str, str], spool_threshold: int, max_field_size: int) -> None:
+        self.headers = headers
+        disposition, params = parse_header(headers.get('content-disposition', ''))
+        if disposition != 'form-data' or 'name' not in params:
+            raise MultipartError("Multipart part without a form-data Content-Disposition")
+        self.name: str = params['name']
+        self.filename: Optional[str] = params.get('filename')
+        self.content_type = headers.get('content-type', 'text/plain' if self.filename is None else
+                                        'application/octet-stream')
+        self.max_field_size = max_field_size
+        self.spool_threshold = spool_threshold
+        # Fields are kept in memory, files are spooled
+        self.data: Union[bytearray, UploadedFile] = (
+            bytearray() if self.filename is None else UploadedFile(self.filename, self.content_type, spool_threshold))
+
+    @property
+    def is_file(self) -> bool:
+        return self.filename is not None
+
+    # Bytes of the part held in memory, a file spools to disk past the threshold
+    @property
+    def memory(self) -> int:
+        if self.filename is None:
+            return len(self.data)
+        return min(self.data.size, self.spool_threshold)
+
+    @property
+    def value(self) -> Union[str, UploadedFile]:
+        if self.filename is None:
+            charset = parse_header(self.content_type)[1].get('charset', 'utf-8')
+            return self.data.decode(charset, errors='replace')
+        return self.data
+
+    def write(self, data: bytes) -> None:
+        if self.filename is not None:
+            self.data.write(data)
+            return
+        if len(self.data) + len(data) > self.max_field_size:
+            raise MultipartError(f"Multipart field '{self.name}' is larger than {self.max_field_size} bytes")
+        self.data += data
+
+
+def parse_header(value: str) -> Tuple[str, Dict[str, str]]:
+    # 'multipart/form-data; boundary=xyz' returns ('multipart/form-data', {'boundary': 'xyz'})
+    main_value, _, _ = value.partition(';')
+    params = {}
+    for match in HEADER_PARAMETER_PATTERN.finditer(value[len(main_value):]):
+        quoted, token = match.group(2), match.group(3)
+        params[match.group(1).lower()] = re.sub(r'\\(.)', r'\1', quoted) if quoted is not None else token
+    return main_value.strip().lower(), params
+
+
+def get_boundary(content_type: str) -> bytes:
+    mime_type, params = parse_header(content_type)
+    boundary = params.get('boundary')
+    if mime_type != 'multipart/form-data' or not boundary or len(boundary) > 200:
+        raise MultipartError("Invalid multipart/form-data boundary")
+    return boundary.encode('latin-1')
+
+
+def parse_multipart(chunks: Iterable[bytes], boundary: bytes, spool_threshold: int = DEFAULT_SPOOL_THRESHOLD,
+                    max_field_size: int = MAX_FIELD_SIZE, max_parts: int = MAX_PARTS,
+                    max_memory: int = MAX_MEMORY) -> Iterator[MultipartPart]:
+    """
+    Parses a multipart/form-data body incrementally, yielding each part once it is complete.
+    Only the current chunk and a delimiter worth of bytes are buffered, on top of the parts themselves: fields
+    (up to max_field_size) in memory and files in temporary files past spool_threshold. The parts keep at most
+    max_memory bytes in memory altogether.
+    """
+    delimiter = b'\r\n--' + boundary
+    # The first delimiter is not preceded by a line break, add one so every delimiter looks the same
+    buffer = bytearray(b'\r\n')
+    state = 'preamble'
+    part: Optional[MultipartPart] = None
+    parts = 0
+    # Memory held by the completed parts
+    memory = 0
+
+    for chunk in chunks:
+        buffer += chunk
+        while True:
+            if state == 'preamble':
+                index = buffer.find(delimiter)
+                if index < 0:
+                    del buffer[:max(0, len(buffer) - len(delimiter))]
+                    break
+                del buffer[:index + len(delimiter)]
+                state = 'delimiter'
+
+            elif state == 'delimiter':
+                # A delimiter is followed by '--' for the last one, or by a line break and the headers of a part
+                if len(buffer) < 2:
+                    break
+                if buffer[:2] == b'--':
+                    state = 'done'
+                    break
+                if buffer[:2] != b'\r\n':
+                    raise MultipartError("Invalid multipart delimiter")
+                del buffer[:2]
+                state = 'headers'
+
+            elif state == 'headers':
+                index = buffer.find(b'\r\n\r\n')
+                if index < 0:
+                    if len(buffer) > MAX_HEADER_SIZE:
+                        raise MultipartError("Multipart part headers are too large")
+                    break
+                parts += 1
+                if parts > max_parts:
+                    raise MultipartError(f"More than {max_parts} multipart parts")
+                part = MultipartPart(_parse_part_headers(bytes(buffer[:index])), spool_threshold, max_field_size)
+                del buffer[:index + 4]
+                state = 'body'
+
+            elif state == 'body':
+                index = buffer.find(delimiter)
+                if index < 0:
+                    # Everything but a possible start of the delimiter belongs to the part
+                    end = len(buffer) - len(delimiter) + 1
+                    if end > 0:
+                        part.write(bytes(buffer[:end]))
+                        del buffer[:end]
+                        _check_memory(memory + part.memory, max_memory)
+                    break
+                part.write(bytes(buffer[:index]))
+                del buffer[:index + len(delimiter)]
+                memory += part.memory
+                _check_memory(memory, max_memory)
+                yield part
+                part = None
+                state = 'delimiter'
+
+            else:
+                # The epilogue after the last delimiter is ignored
+                buffer.clear()
+                break
+
+    if state != 'done':
+        raise MultipartError("Unexpected end of multipart body")
+
+
+def _check_memory(memory: int, max_memory: int) -> None:
+    if memory > max_memory:
+        raise MultipartError(f"Multipart parts take more than {max_memory} bytes of memory")
+
+
+def _parse_part_headers(data: bytes) -> Dict[str, str]:
+    headers = {}
+    for line in data.decode('utf-8', errors='replace').split('\r\n'):
+        name, separator, value = line.partition(':')
+        if not separator:
+            raise MultipartError("Invalid multipart part header")
+        headers[name.strip().lower()] = value.strip()
+    return headers
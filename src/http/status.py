@@ -0,0 +1,30 @@
+from http import HTTPStatus
+from types import MappingProxyType
+from typing import Mapping, Tuple, Union
+
+# Status lines of every registered HTTP status code, built once: {200: '200 OK', 404: '404 Not Found', ...}
+STATUS_LINES: Mapping[int, str] = MappingProxyType({
+    status.value: f'{status.value} {status.phrase}' for status in HTTPStatus
+})
+
+UNKNOWN_STATUS = 'Unknown Status'
+
+
+def status_line(code: int) -> str:
+    line = STATUS_LINES.get(code)
+    if line is None:
+        if not 100 <= code <= 999:
+            raise ValueError(f"Invalid HTTP status code: {code}")
+        line = f'{code} {UNKNOWN_STATUS}'
+    return line
+
+
+def parse_status(status: Union[int, str]) -> Tuple[int, str]:
+    # 200 or '200 OK' returns (200, '200 OK'); a status line is kept as given, its reason phrase included
+    if isinstance(status, int):
+        return status, status_line(status)
+    code, _, _ = status.partition(' ')
+    try:
+        return int(code), status
+    except ValueError:
+        raise ValueError(f"Invalid HTTP status line: {status!r}") from None
@@ -0,0 +1,176 @@
+import atexit
+import logging
+import os
+import queue
+import sys
+import threading
+
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+from src.config import config
+
+LEVELS = {
+    'debug': logging.DEBUG,
+    'info': logging.INFO,
+    'warning': logging.WARNING,
+    'error': logging.ERROR,
+}
+
+# Records waiting to be written at most; past it (a stuck or slow handler) new records are dropped
+MAX_QUEUED_RECORDS = 10000
+
+
+class _DroppingQueueHandler(QueueHandler):
+    # Starts the listener of the current process on the first record, and drops records when the queue is full
+    def emit(self, record: logging.LogRecord) -> None:
+        if _listener_pid != os.getpid():
+            _start_listener()
+        super().emit(record)
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        global _dropped
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            # Request threads can drop records at the same time
+            with _dropped_lock:
+                _dropped += 1
+
+
+class _Listener(QueueListener):
+    # Waits for room in a full queue to stop, instead of failing
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+# Every framework logger lives under this namespace and writes to a bounded queue.
+# A listener thread drains the queue into the real handler, so request threads never block on I/O. The thread is
+# started lazily, once per process: a fork (e.g. gunicorn --preload) does not inherit it, the child starts its own.
+_root = logging.getLogger('y_wsgi')
+_root.propagate = False
+_queue_handler = _DroppingQueueHandler(queue.Queue(MAX_QUEUED_RECORDS))
+_root.addHandler(_queue_handler)
+_handler: Optional[logging.Handler] = None
+_listener: Optional[_Listener] = None
+_listener_pid: Optional[int] = None
+_listener_lock = threading.Lock()
+_dropped = 0
+_dropped_lock = threading.Lock()
+_loggers: Dict[str, 'FrameworkLogger'] = {}
+
+
+class StructuredFormatter(logging.Formatter):
+    # Renders 'message key=value key=value'
+    def format(self, record: logging.LogRecord) -> str:
+        message = super().format(record)
+        fields = getattr(record, 'fields', None)
+        if fields:
+            message += ' ' + ' '.join(f'{key}={value!r}' for key, value in fields.items())
+        return message
+
+
+def _noop(message: str, **fields: Any) -> None:
+    pass
+
+
+class FrameworkLogger:
+    """
+    Level-gated structured logger: `logger.debug("Route matched", path=path)`.
+    Methods for disabled levels are bound to a no-op, so a disabled call costs a single function call and
+    never formats its message.
+    """
+
+    def __init__(self, name: str):
+        self._logger = logging.getLogger(f'y_wsgi.{name}')
+        self._bind()
+
+    def _bind(self) -> None:
+        for method_name, level in LEVELS.items():
+            setattr(self, method_name, self._emitter(level) if _root.isEnabledFor(level) else _noop)
+
+    def _emitter(self, level: int):
+        logger = self._logger
+
+        def emit(message: str, **fields: Any) -> None:
+            logger.log(level, message, extra={'fields': fields})
+        return emit
+
+    def debug(self, message: str, **fields: Any) -> None:
+        pass
+
+    def info(self, message: str, **fields: Any) -> None:
+        pass
+
+    def warning(self, message: str, **fields: Any) -> None:
+        pass
+
+    def error(self, message: str, **fields: Any) -> None:
+        pass
+
+
+def get_logger(name: str) -> FrameworkLogger:
+    if name not in _loggers:
+        _loggers[name] = FrameworkLogger(name)
+    return _loggers[name]
+
+
+def configure_logging(debug: bool, handler: Optional[logging.Handler] = None) -> None:
+    global _handler
+    _root.setLevel(logging.DEBUG if debug else logging.INFO)
+    if handler is not None:
+        # The records queued so far go to the previous handler, the listener restarts with the new one
+        shutdown_logging()
+        _handler = handler
+    # Rebind already created loggers, so the new level takes effect everywhere
+    for logger in _loggers.values():
+        logger._bind()
+
+
+# Stops the listener thread once every queued record has been written
+def shutdown_logging() -> None:
+    global _listener, _listener_pid
+    with _listener_lock:
+        if _listener is not None and _listener_pid == os.getpid():
+            _listener.stop()
+        _listener = None
+        _listener_pid = None
+
+
+def default_handler() -> logging.Handler:
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(StructuredFormatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+    return handler
+
+
+# Records dropped because the queue was full
+def dropped_records() -> int:
+    return _dropped
+
+
+def _start_listener() -> None:
+    global _handler, _listener, _listener_pid
+    with _listener_lock:
+        if _listener_pid == os.getpid():
+            return
+        if _handler is None:
+            _handler = default_handler()
+        _listener = _Listener(_queue_handler.queue, _handler, respect_handler_level=True)
+        _listener.start()
+        _listener_pid = os.getpid()
+
+
+def _after_fork_in_child() -> None:
+    # The parent's listener thread does not exist in the child, and its queue or lock may have been held by another
+    # thread at the time of the fork: the child gets fresh ones, its listener starts with its first record
+    global _listener, _listener_pid, _listener_lock, _dropped_lock
+    _listener = None
+    _listener_pid = None
+    _listener_lock = threading.Lock()
+    _dropped_lock = threading.Lock()
+    _queue_handler.queue = queue.Queue(MAX_QUEUED_RECORDS)
+
+
+_root.setLevel(logging.DEBUG if config.DEBUG else logging.INFO)
+os.register_at_fork(after_in_child=_after_fork_in_child)
+atexit.register(shutdown_logging)
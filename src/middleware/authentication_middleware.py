@@ -7,8 +7,11 @@ from src.core.request import Request
 from src.core.response import Response
 from src.middleware.middleware import Middleware
 from src.config_loader import load_config
+from src.logger.logger import get_logger
 from src.utils.merge_configs import BaseConfig, merge_configs
 
+logger = get_logger(__name__)
+
 
 class AuthenticationMiddleware(Middleware):
 
@@ -25,7 +28,7 @@ class AuthenticationMiddleware(Middleware):
     def before_request(self, request: Request):
         for public_route in self.public_routes:
             if re.fullmatch(public_route, request.path):
-                print(f"Framework's Middleware: Path {request.path} matches public route {public_route}")
+                logger.debug("Path matches public route", path=request.path, public_route=public_route)
                 return None  # Skip authentication for public routes
 
         username = request.headers.get("x-username")
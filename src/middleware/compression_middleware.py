@@ -0,0 +1,210 @@
+import hashlib
+import zlib
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from src.cache.lru_cache import LRUCache
+from src.core.request_context import RequestContext
+from src.core.response import Response, StreamingResponse
+from src.http.headers import Headers
+from src.middleware.middleware import Middleware
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Content types that are already compressed, compressing them again only costs CPU
+COMPRESSED_CONTENT_TYPES = (
+    'image/', 'video/', 'audio/', 'font/woff', 'application/zip', 'application/gzip', 'application/x-gzip',
+    'application/x-bzip2', 'application/x-xz', 'application/x-7z-compressed', 'application/x-rar-compressed',
+    'application/zstd', 'application/pdf', 'application/octet-stream',
+)
+# Image formats that are text and compress well
+COMPRESSIBLE_IMAGE_TYPES = ('image/svg+xml', 'image/x-icon', 'image/bmp')
+
+
+class _ZlibCompressor:
+    # gzip for 'gzip', the zlib format for 'deflate' (RFC 9110)
+    def __init__(self, encoding: str, level: int) -> None:
+        wbits = zlib.MAX_WBITS | 16 if encoding == 'gzip' else zlib.MAX_WBITS
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, wbits)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    # What was compressed so far, so a streamed chunk reaches the client without waiting for the next one
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliCompressor:
+    def __init__(self, encoding: str, level: int) -> None:
+        # Brotli qualities go from 0 to 11, zlib levels from 1 to 9
+        self._compressor = brotli.Compressor(quality=min(11, max(0, level - 1)))
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+# Supported encodings, preferred first, and their compressors (brotli only when the package is installed)
+COMPRESSORS = {'br': _BrotliCompressor, 'gzip': _ZlibCompressor, 'deflate': _ZlibCompressor}
+if brotli is None:
+    del COMPRESSORS['br']
+
+
+class CompressionMiddleware(Middleware):
+    """
+    Compresses responses with the best encoding the client accepts (Accept-Encoding): brotli when the `brotli`
+    package is installed, then gzip, then deflate. Streaming responses are compressed chunk by chunk as they are
+    sent, and bodies smaller than `min_size` or of already compressed content types are sent as they are.
+
+    Responses with an ETag (e.g. those held by `cache_view`) are compressed once per encoding: the compressed
+    bodies are kept in an LRU cache of `cache_size` entries keyed by a digest of the body and the encoding. The
+    compressed variant gets the weak version of the ETag (W/"..."), which If-None-Match still matches. Responses are
+    never modified in place, since a cached response is returned again on the next hit. Register it last, so it
+    compresses the final body.
+    """
+
+    def __init__(self, min_size: int = 500, level: int = 6, cache_size: int = 256,
+                 encodings: Optional[Iterable[str]] = None) -> None:
+        super().__init__()
+        self.min_size = min_size
+        self.level = level
+        encodings = COMPRESSORS if encodings is None else encodings
+        unknown = [encoding for encoding in encodings if encoding not in COMPRESSORS]
+        if unknown:
+            raise ValueError(f"Unsupported encodings: {', '.join(unknown)}")
+        # Kept in the order of preference of COMPRESSORS
+        self.encodings: Tuple[str, ...] = tuple(encoding for encoding in COMPRESSORS if encoding in encodings)
+        self.cache = LRUCache(max_size=cache_size)
+
+    def after_request(self, request_context: RequestContext, response: Response) -> Optional[Response]:
+        if not self._is_compressible(response):
+            return response
+        encoding = negotiate_encoding(request_context.headers.get('Accept-Encoding', ''), self.encodings)
+        if encoding is None:
+            # The body depends on Accept-Encoding, whatever this client accepts. Streaming responses are never
+            # cached, they can be updated in place.
+            if response.streaming:
+                _add_vary(response.headers)
+                return response
+            headers = Headers(response.headers)
+            _add_vary(headers)
+            return Response(body=response.body, status=response.status, headers=headers)
+
+        if response.streaming:
+            return self._compress_stream(response, encoding)
+
+        body = b''.join(response.body)
+        if len(body) < self.min_size:
+            if isinstance(response.body, (list, tuple)):
+                return response
+            # The joined iterator is used up, the body is sent from the joined bytes
+            return Response(body=[body], status=response.status, headers=Headers(response.headers))
+        etag = response.headers.get('ETag')
+        # Keyed on the body itself, two responses can share an ETag (e.g. a version tag) but not their bytes
+        cache_key = (hashlib.sha1(body).digest(), encoding) if etag else None
+        compressed = self.cache.get(cache_key) if etag else None
+        if compressed is None:
+            compressed = self._compress(body, encoding)
+            if etag:
+                self.cache.set(cache_key, compressed)
+
+        headers = self._compressed_headers(response.headers, encoding)
+        headers['Content-Length'] = str(len(compressed))
+        return Response(body=[compressed], status=response.status, headers=headers)
+
+    def _is_compressible(self, response: Response) -> bool:
+        status_code = response.status_code
+        if status_code < 200 or status_code in (204, 304):
+            return False
+        headers = response.headers
+        if 'Content-Encoding' in headers or 'no-transform' in headers.get('Cache-Control', ''):
+            return False
+        content_type = headers.get('Content-Type', '').lower()
+        if content_type.startswith(COMPRESSED_CONTENT_TYPES) and not content_type.startswith(COMPRESSIBLE_IMAGE_TYPES):
+            return False
+        # A streaming body of known size (e.g. a file) can be skipped early, the others are measured once joined
+        content_length = headers.get('Content-Length')
+        return not (response.streaming and content_length and int(content_length) < self.min_size)
+
+    def _compress(self, body: bytes, encoding: str) -> bytes:
+        compressor = COMPRESSORS[encoding](encoding, self.level)
+        return compressor.compress(body) + compressor.finish()
+
+    def _compress_stream(self, response: StreamingResponse, encoding: str) -> StreamingResponse:
+        compressor = COMPRESSORS[encoding](encoding, self.level)
+        # The original body is iterated (and closed) through wsgi_body, which sends files chunk by chunk
+        chunks = _compress_chunks(response.wsgi_body({}), compressor)
+        headers = self._compressed_headers(response.headers, encoding)
+        return StreamingResponse(chunks, status=response.status, headers=headers, block_size=response.block_size)
+
+    @staticmethod
+    def _compressed_headers(headers: Headers, encoding: str) -> Headers:
+        headers = Headers(headers)
+        _add_vary(headers)
+        headers.pop('Content-Length', None)
+        headers['Content-Encoding'] = encoding
+        # A strong ETag identifies the exact bytes, the compressed ones differ from the identity ones (RFC 9110)
+        etag = headers.get('ETag')
+        if etag and not etag.startswith('W/'):
+            headers['ETag'] = f'W/{etag}'
+        return headers
+
+
+def negotiate_encoding(accept_encoding: str, encodings: Iterable[str]) -> Optional[str]:
+    """
+    Returns the encoding of `encodings` (in order of preference) the client weights highest in its Accept-Encoding
+    header, e.g. 'gzip' for 'gzip, deflate;q=0.5', or None when it accepts none of them.
+    """
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(','):
+        name, _, params = item.partition(';')
+        weight = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in encodings:
+        weight = weights.get(encoding, weights.get('*', 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def _add_vary(headers: Headers) -> None:
+    vary = headers.get('Vary')
+    if not vary:
+        headers['Vary'] = 'Accept-Encoding'
+    elif vary.strip() != '*' and 'accept-encoding' not in vary.lower():
+        headers['Vary'] = f'{vary}, Accept-Encoding'
+
+
+def _compress_chunks(chunks: Iterable[bytes], compressor) -> Iterator[bytes]:
+    try:
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            data += compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
@@ -20,7 +20,7 @@ class CORSMiddleware(Middleware):
 
     # Preflight request
     def before_request(self, request_context: RequestContext) -> Optional[Response]:
-        origin = request_context.headers.get("Origin") or request_context.headers.get("origin", "")
+        origin = request_context.headers.get("Origin", "")
         if origin and (origin in self.allowed_origins or "*" in self.allowed_origins):
             if request_context.method == "OPTIONS":
                 response = Response(status=200)
@@ -33,7 +33,7 @@ class CORSMiddleware(Middleware):
         return response
 
     def _set_cors_headers(self, request_context: RequestContext, response: Response) -> None:
-        origin = request_context.headers.get("Origin") or request_context.headers.get("origin", "")
+        origin = request_context.headers.get("Origin", "")
         if "*" in self.allowed_origins or origin in self.allowed_origins:
             response.set_header("Access-Control-Allow-Origin", origin if "*" not in self.allowed_origins else "*")
             response.set_header("Access-Control-Allow-Methods", ", ".join(self.allowed_methods))
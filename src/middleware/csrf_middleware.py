@@ -7,6 +7,9 @@ from src.middleware.middleware import Middleware
 from src.middleware.csrf_token import CSRFToken
 from src.config_loader import load_config
 
+# Header carrying the token for requests without a form (e.g. JSON), the one the token is sent in on GET
+CSRF_HEADER = 'X-CSRF-Token'
+
 
 class CSRFMiddleware(Middleware):
     def __init__(self, config, *args, **kwargs):
@@ -14,6 +17,8 @@ class CSRFMiddleware(Middleware):
         self.config = config if config else load_config()
         secret_key = config.SECRET_KEY
         self.csrf_token = CSRFToken(secret_key)
+        # Opt-in only: JSON requests skip the check (e.g. APIs authenticated without cookies)
+        self.exempt_json = getattr(self.config, 'CSRF_EXEMPT_JSON', False)
 
     def before_request(self, request_context: RequestContext) -> Optional[Response]:
         session_context: SessionContext = request_context.session_context
@@ -23,11 +28,12 @@ class CSRFMiddleware(Middleware):
             else:
                 return Response(b"Session not initialized", status="500 Internal Server Error")
 
-        if request_context.request.headers.get('Content-Type') == 'application/json':
-            return None
-
         if request_context.method in ('POST', 'PUT', 'PATCH', 'DELETE'):
-            token = request_context.form_data.get("csrf_token")
+            content_type = request_context.headers.get('Content-Type', '')
+            if self.exempt_json and content_type.startswith('application/json'):
+                return None
+            # The header for JSON and other non-form bodies, the form field otherwise
+            token = request_context.headers.get(CSRF_HEADER) or request_context.form_data.get("csrf_token")
             if not token or token != self.csrf_token.generate_csrf_token(request_context.session_context.id):
                 return Response(b"Invalid CSRF Token", status="403 Forbidden")
         return None
@@ -36,5 +42,5 @@ class CSRFMiddleware(Middleware):
         if request_context.method == "GET":
             token: str = self.csrf_token.generate_csrf_token(request_context.session_context.id)
             request_context.set_csrf_token(token)
-            response.headers_dict["X-CSRF-Token"] = token
+            response.headers_dict[CSRF_HEADER] = token
         return response
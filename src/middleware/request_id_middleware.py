@@ -0,0 +1,37 @@
+import re
+import uuid
+from typing import Any, Dict, Iterable, Optional
+
+from src.middleware.wsgi_middleware import StartResponseType, WSGIApp, WSGIMiddleware
+
+# Incoming request IDs are kept only if they are short and printable, so they are safe to log and echo
+VALID_REQUEST_ID = re.compile(r'[\w.:-]{1,128}')
+
+
+class RequestIDMiddleware(WSGIMiddleware):
+    """
+    Tags every request with an ID, reused from the incoming header (e.g. set by a load balancer) or generated.
+    The ID is stored in the environ under `ENVIRON_KEY` and echoed in the response headers.
+    """
+    ENVIRON_KEY = 'y_wsgi.request_id'
+
+    def __init__(self, app: WSGIApp, header_name: str = 'X-Request-ID'):
+        super().__init__(app)
+        self.header_name = header_name
+        self._environ_header = 'HTTP_' + header_name.upper().replace('-', '_')
+
+    def __call__(self, environ: Dict[str, Any], start_response: StartResponseType) -> Iterable[bytes]:
+        request_id = self._incoming_request_id(environ) or uuid.uuid4().hex
+        environ[self.ENVIRON_KEY] = request_id
+
+        def start_response_with_request_id(status, headers, exc_info=None):
+            headers.append((self.header_name, request_id))
+            return start_response(status, headers, exc_info)
+
+        return self.app(environ, start_response_with_request_id)
+
+    def _incoming_request_id(self, environ: Dict[str, Any]) -> Optional[str]:
+        request_id = environ.get(self._environ_header)
+        if request_id and VALID_REQUEST_ID.fullmatch(request_id):
+            return request_id
+        return None
@@ -6,6 +6,9 @@ from src.middleware.middleware import Middleware
 from src.core.response import Response
 from src.core.request_context import RequestContext
 from src.signals.signal_manager import SignalManager
+from src.logger.logger import get_logger
+
+logger = get_logger(__name__)
 
 
 class ResponseTimeMiddleware(Middleware):
@@ -33,5 +36,5 @@ class ResponseTimeMiddleware(Middleware):
     def on_request_finished(self, request_context, response):
         if self.start_time:
             elapsed_time = time.time() - self.start_time
-            print(f"Request for {request_context.path} took {elapsed_time:.8f} seconds")
+            logger.debug("Request timed", path=request_context.path, seconds=round(elapsed_time, 8))
             response.set_header('X-Response-Time', f'{elapsed_time:.8f} seconds')
@@ -39,8 +39,9 @@ class SessionMiddleware(Middleware):
         request_context.session_context = session_context
 
     def after_request(self, request_context: RequestContext, response: Response) -> Response:
-        if hasattr(request_context.request, 'session_id_to_set'):
-            response.set_header('Set-Cookie', request_context.request.session_id_to_set)
+        if request_context.request.session_id_to_set:
+            # Added, not set: the view may have set cookies of its own
+            response.add_header('Set-Cookie', request_context.request.session_id_to_set)
         return response
 
     def _set_session_id(self, request_context: RequestContext, session_id: str):
@@ -0,0 +1,43 @@
+import os
+from typing import Any, Dict, Iterable, Optional
+
+from src.core.prebuilt_response import FileResponse
+from src.middleware.wsgi_middleware import StartResponseType, WSGIApp, WSGIMiddleware
+
+
+class StaticFilesMiddleware(WSGIMiddleware):
+    """
+    Serves the files of a directory under a URL prefix (e.g. '/assets') before the request reaches any app.
+    Files are read once and kept in memory with their ETag, unless `cache` is False.
+    Requests under the prefix for files that do not exist continue to the apps.
+    """
+
+    def __init__(self, app: WSGIApp, url_prefix: str, directory: str, cache: bool = True):
+        super().__init__(app)
+        self.url_prefix = url_prefix.rstrip('/') + '/'
+        self.directory = os.path.realpath(directory)
+        self.cache = cache
+        self._files: Dict[str, FileResponse] = {}
+
+    def __call__(self, environ: Dict[str, Any], start_response: StartResponseType) -> Iterable[bytes]:
+        path = environ.get('PATH_INFO', '')
+        if path.startswith(self.url_prefix) and environ.get('REQUEST_METHOD') in ('GET', 'HEAD'):
+            file_response = self._get_file_response(path[len(self.url_prefix):])
+            if file_response is not None:
+                body = file_response(environ, start_response)
+                return [] if environ['REQUEST_METHOD'] == 'HEAD' else body
+        return self.app(environ, start_response)
+
+    def _get_file_response(self, relative_path: str) -> Optional[FileResponse]:
+        file_response = self._files.get(relative_path)
+        if file_response is not None:
+            return file_response
+
+        file_path = os.path.realpath(os.path.join(self.directory, relative_path))
+        # Reject paths escaping the directory ('../') and anything that is not a regular file
+        if os.path.commonpath([self.directory, file_path]) != self.directory or not os.path.isfile(file_path):
+            return None
+        file_response = FileResponse(file_path)
+        if self.cache:
+            self._files[relative_path] = file_response
+        return file_response
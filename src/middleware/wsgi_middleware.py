@@ -0,0 +1,18 @@
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+StartResponseType = Callable[[str, List[Tuple[str, str]], Any], None]
+WSGIApp = Callable[[Dict[str, Any], StartResponseType], Iterable[bytes]]
+
+
+class WSGIMiddleware:
+    """
+    Middleware registered on the Dispatcher with `Dispatcher.use`. It wraps the whole dispatch as a plain
+    WSGI application, so it runs once per request for every mounted app, before any Request or RequestContext
+    is allocated. Answer the request directly to short-circuit the apps, or call `self.app` to continue.
+    """
+
+    def __init__(self, app: WSGIApp, *args, **kwargs):
+        self.app = app
+
+    def __call__(self, environ: Dict[str, Any], start_response: StartResponseType) -> Iterable[bytes]:
+        return self.app(environ, start_response)
@@ -22,7 +22,11 @@ class XSSProtectionMiddleware(Middleware):
     def after_request(self, request_context: RequestContext, response: Response) -> Optional[Response]:
         nonce = request_context.request.environ.get('nonce', '')
 
-        if isinstance(response.body, list):
+        if response.streaming:
+            # Chunks are sanitized as they are sent. Only HTML is, so files keep being sent with sendfile.
+            if response.headers_dict.get('Content-Type', '').startswith('text/html'):
+                response.transform(self.sanitize_output)
+        elif isinstance(response.body, list):
             sanitized_body = [self.sanitize_output(part) for part in response.body]
             response.body = sanitized_body
         elif isinstance(response.body, bytes):
@@ -0,0 +1,73 @@
+import re
+from typing import Dict, List, Optional, Pattern, Tuple
+
+from src.routing.lazy_route import LazyRoute
+from src.routing.route_matcher import RouteMatcher, RouteMatch
+
+# Named groups inside a route regex, renamed so they stay unique in the combined pattern
+GROUP_NAME_PATTERN = re.compile(r'\(\?P<(\w+)>')
+
+
+class AlternationRouteMatcher(RouteMatcher):
+    """
+    Compiles every route into one alternation regex, so a match (or a miss) costs a single
+    regex execution. Alternatives keep registration order, which preserves first-match semantics.
+    """
+
+    def __init__(self):
+        self._routes: List[LazyRoute] = []
+        # (combined regex, {route group: (route, [(combined group, param name)])})
+        self._compiled: Optional[Tuple[Pattern, Dict[str, Tuple[LazyRoute, List[Tuple[str, str]]]]]] = None
+
+    def add(self, route: LazyRoute) -> None:
+        self._routes.append(route)
+        # Recompiled lazily on the next match
+        self._compiled = None
+
+    def match(self, path: str) -> Optional[RouteMatch]:
+        compiled = self._compiled
+        if compiled is None:
+            compiled = self._compiled = self._compile(self._routes)
+
+        regex, groups = compiled
+        match = regex.match(path)
+        if match is None:
+            return None
+        # The route wrapper group closes after its params, so it is always the last group matched
+        route, params = groups[match.lastgroup]
+        converted = route.convert({name: match.group(group) for group, name in params})
+        if converted is not None:
+            return route, converted
+
+        # A converter rejected the text its regex accepted, so the remaining routes are tried one by one
+        routes = self._routes
+        for route in routes[routes.index(route) + 1:]:
+            match = route.regex.match(path)
+            if match:
+                converted = route.convert(match.groupdict())
+                if converted is not None:
+                    return route, converted
+        return None
+
+    def compile(self) -> None:
+        if self._compiled is None:
+            self._compiled = self._compile(self._routes)
+
+    @staticmethod
+    def _compile(routes: List[LazyRoute]) -> Tuple[Pattern, Dict[str, Tuple[LazyRoute, List[Tuple[str, str]]]]]:
+        alternatives = []
+        groups = {}
+        for index, route in enumerate(routes):
+            params = []
+
+            def rename(group: re.Match) -> str:
+                combined_name = f'r{index}_{group.group(1)}'
+                params.append((combined_name, group.group(1)))
+                return f'(?P<{combined_name}>'
+
+            # Route regexes are anchored with '^...$', the combined regex is anchored once
+            pattern = GROUP_NAME_PATTERN.sub(rename, route.regex.pattern[1:-1])
+            route_group = f'route{index}'
+            alternatives.append(f'(?P<{route_group}>{pattern})')
+            groups[route_group] = (route, params)
+        return re.compile(f'^(?:{"|".join(alternatives)})$'), groups
@@ -1,5 +1,7 @@
 import re
-from typing import Type, Union, Callable, Optional, Tuple, Dict, Any, List
+import uuid
+from typing import Type, Union, Callable, Optional, Tuple, Dict, Any, List, Iterable
+from urllib.parse import quote, urlencode
 
 from src.core.request import Request
 from src.core.response import Response
@@ -7,16 +9,111 @@ from src.core.view import View
 
 HandlerType = Union[Type[View], Callable[..., Response]]
 
+# Matches '<name>' and '<converter:name>' placeholders in a route path
+PLACEHOLDER_PATTERN = re.compile(r'<(?:(\w+):)?(\w+)>')
+
+# Characters that make a path (or path segment) a regular expression rather than a literal
+REGEX_SPECIAL_CHARACTERS = frozenset('^$*+?{}[]\\|()<>')
+
+
+class Converter:
+    """
+    Turns a placeholder of a route path into a typed parameter.
+    `regex` constrains what the placeholder matches, `to_python` converts the matched text (raising ValueError
+    rejects the match) and `to_url` converts a value back when building URLs.
+    """
+    regex = r'[^/]+'
+    # Whether the placeholder stays within a single path segment
+    single_segment = True
+
+    def __init__(self):
+        self.pattern = re.compile(self.regex)
+
+    def to_python(self, value: str) -> Any:
+        return value
+
+    def to_url(self, value: Any) -> str:
+        return quote(str(value), safe='')
+
+
+class StringConverter(Converter):
+    pass
+
+
+class IntConverter(Converter):
+    regex = r'[0-9]+'
+
+    def to_python(self, value: str) -> int:
+        return int(value)
+
+
+class FloatConverter(Converter):
+    regex = r'[0-9]+\.[0-9]+'
+
+    def to_python(self, value: str) -> float:
+        return float(value)
+
+
+class UUIDConverter(Converter):
+    regex = r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}'
+
+    def to_python(self, value: str) -> uuid.UUID:
+        return uuid.UUID(value)
+
+
+class SlugConverter(Converter):
+    regex = r'[-a-zA-Z0-9_]+'
+
+
+class PathConverter(Converter):
+    regex = r'.+'
+    single_segment = False
+
+    def to_url(self, value: Any) -> str:
+        return quote(str(value), safe='/')
+
+
+# Converters available to route placeholders, keyed by the name used in the path ('<int:id>')
+CONVERTERS: Dict[str, Converter] = {
+    'str': StringConverter(),
+    'int': IntConverter(),
+    'float': FloatConverter(),
+    'uuid': UUIDConverter(),
+    'slug': SlugConverter(),
+    'path': PathConverter(),
+}
+
+
+def register_converter(name: str, converter: Converter) -> None:
+    CONVERTERS[name] = converter
+
+
+def get_converter(name: Optional[str]) -> Converter:
+    # Placeholders without a converter ('<name>') are strings
+    converter = CONVERTERS.get(name or 'str')
+    if converter is None:
+        raise ValueError(f"Unknown route converter: {name}")
+    return converter
+
 
 class LazyRoute:
     def __init__(self, path: str, module_dir: str, handler_factory: Optional[Callable[[], HandlerType]] = None,
-                 methods: List[str] = None) -> None:
+                 methods: List[str] = None, name: Optional[str] = None) -> None:
         self.path = path
+        self.name = name
         self.module_dir = module_dir
         self._handler = None
         self._handler_factory = handler_factory
         self.methods = methods if methods else ['GET']
+        # Parameter name -> converter, in path order
+        self.converters: Dict[str, Converter] = {
+            match.group(2): get_converter(match.group(1)) for match in PLACEHOLDER_PATTERN.finditer(path)
+        }
         self.regex = re.compile(self._convert_path_to_regex(path))
+        # A static route has no placeholders and no regex syntax, so it can only match its own path
+        self.is_static = not REGEX_SPECIAL_CHARACTERS.intersection(path)
+        # str.format template used to build URLs, e.g. '/user/{id}' (None if the path contains regex syntax)
+        self.url_template = self._convert_path_to_template(path)
         # print(f"Converted path '{self.path}' to regex '{self.regex.pattern}'")  # Debugging output
 
     @property
@@ -31,27 +128,54 @@ class LazyRoute:
             return None
         match = self.regex.match(path)
         if match:
-            return self.handler, match.groupdict()
+            params = self.convert(match.groupdict())
+            if params is not None:
+                return self.handler, params
         return None
 
+    # Converts the matched text of every placeholder, or returns None if a converter rejects it
+    def convert(self, params: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        try:
+            return {name: self.converters[name].to_python(value) if name in self.converters else value
+                    for name, value in params.items()}
+        except ValueError:
+            return None
+
+    def build_url(self, params: Dict[str, Any]) -> str:
+        if self.url_template is None:
+            raise ValueError(f"Cannot build a URL for route '{self.path}'")
+        try:
+            values = {name: converter.to_url(params[name]) for name, converter in self.converters.items()}
+        except KeyError as e:
+            raise ValueError(f"Missing parameter {e} to build a URL for route '{self.path}'")
+        url = self.url_template.format_map(values)
+
+        # Parameters that are not part of the path become the query string
+        if len(params) > len(values):
+            url += '?' + urlencode({k: v for k, v in params.items() if k not in values}, doseq=True)
+        return url
+
+    def build_urls(self, params_list: Iterable[Dict[str, Any]]) -> List[str]:
+        return [self.build_url(params) for params in params_list]
+
+    @staticmethod
+    def _convert_path_to_template(path: str) -> Optional[str]:
+        # Braces are regex syntax too, so the literal parts never need escaping for str.format
+        literal_parts = PLACEHOLDER_PATTERN.split(path)[::3]
+        if any(REGEX_SPECIAL_CHARACTERS.intersection(part) for part in literal_parts):
+            return None
+        return PLACEHOLDER_PATTERN.sub(lambda match: '{' + match.group(2) + '}', path)
+
     @staticmethod
     def _convert_path_to_regex(path: str) -> str:
         # print(f"Original path: {path}")  # Debugging output
 
-        # Patterns to replace
-        patterns = {
-            r'<int:(\w+)>': r'(?P<\1>[0-9]+)',
-            r'<str:(\w+)>': r'(?P<\1>[^/]+)',
-            r'<(\w+)>': r'(?P<\1>[^/]+)',  # General pattern for other types
-        }
-
-        # Apply replacements one by one and return immediately once a match is found
-        for pattern, replacement in patterns.items():
-            new_path = re.sub(pattern, replacement, path)
-            if new_path != path:
-                # print(f"Converted regex path: {new_path}")  # Debugging output
-                return f'^{new_path}$'
+        # Replace every placeholder in a single pass, so mixed placeholders such as
+        # '/user/<int:id>/<name>' are all converted
+        def replace(match: re.Match) -> str:
+            converter, name = match.group(1), match.group(2)
+            return f'(?P<{name}>{get_converter(converter).regex})'
 
-        # If no patterns matched, return the original path wrapped in regex start and end anchors
-        # print(f"No patterns matched. Converted regex path: {path}")  # Debugging output
-        return f'^{path}$'
+        new_path = PLACEHOLDER_PATTERN.sub(replace, path)
+        # print(f"Converted regex path: {new_path}")  # Debugging output
+        return f'^{new_path}$'
@@ -0,0 +1,44 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.routing.lazy_route import LazyRoute
+
+RouteMatch = Tuple[LazyRoute, Dict[str, Any]]
+
+
+class RouteMatcher(ABC):
+    """
+    Strategy used by the Router to find the route for a path.
+    The Router keeps one matcher per HTTP method, so every route added to a matcher accepts its method.
+    Routes are added in registration order, and `match` must return the first registered route that matches.
+    """
+
+    @abstractmethod
+    def add(self, route: LazyRoute) -> None:
+        pass
+
+    @abstractmethod
+    def match(self, path: str) -> Optional[RouteMatch]:
+        pass
+
+    # Builds anything the matcher would otherwise build lazily on the first match
+    def compile(self) -> None:
+        pass
+
+
+class LinearRouteMatcher(RouteMatcher):
+    # The original strategy: try every route regex in registration order
+    def __init__(self):
+        self.routes: List[LazyRoute] = []
+
+    def add(self, route: LazyRoute) -> None:
+        self.routes.append(route)
+
+    def match(self, path: str) -> Optional[RouteMatch]:
+        for route in self.routes:
+            match = route.regex.match(path)
+            if match:
+                params = route.convert(match.groupdict())
+                if params is not None:
+                    return route, params
+        return None
@@ -0,0 +1,128 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.routing.lazy_route import LazyRoute, Converter, PLACEHOLDER_PATTERN, REGEX_SPECIAL_CHARACTERS
+from src.routing.route_matcher import RouteMatcher, RouteMatch
+
+
+class _TrieNode:
+    __slots__ = ('static', 'params', 'routes', 'min_order')
+
+    def __init__(self):
+        self.static: Dict[str, '_TrieNode'] = {}
+        # (converter, name, child) in insertion order
+        self.params: List[Tuple[Converter, str, '_TrieNode']] = []
+        # (registration order, route) for routes ending at this node
+        self.routes: List[Tuple[int, LazyRoute]] = []
+        # Lowest registration order of any route below this node, used to prune the search
+        self.min_order: Optional[int] = None
+
+
+class RouteTrie(RouteMatcher):
+    """
+    Segment-based radix tree built at registration time.
+    Static segments are resolved with a dict lookup per path level, parameter segments are typed branches.
+    Routes the trie cannot represent (regex syntax inside a segment, placeholders spanning several segments)
+    are kept in a small fallback list.
+    """
+
+    def __init__(self):
+        self.root = _TrieNode()
+        self._fallback: List[Tuple[int, LazyRoute]] = []
+        self._count = 0
+
+    def add(self, route: LazyRoute) -> None:
+        order = self._count
+        self._count += 1
+
+        segments = self._parse(route)
+        if segments is None:
+            self._fallback.append((order, route))
+            return
+
+        node = self.root
+        self._touch(node, order)
+        for segment in segments:
+            if isinstance(segment, str):
+                node = node.static.setdefault(segment, _TrieNode())
+            else:
+                converter, name = segment
+                node = self._param_child(node, converter, name)
+            self._touch(node, order)
+        node.routes.append((order, route))
+
+    def match(self, path: str) -> Optional[RouteMatch]:
+        best = self._search(self.root, path.split('/'), 0, {}, None)
+
+        for order, route in self._fallback:
+            if best is not None and order >= best[0]:
+                break
+            match = route.regex.match(path)
+            if match:
+                params = route.convert(match.groupdict())
+                if params is not None:
+                    best = (order, route, params)
+                    break
+
+        if best is None:
+            return None
+        return best[1], best[2]
+
+    def _search(self, node: _TrieNode, segments: List[str], index: int, params: Dict[str, Any],
+                best: Optional[Tuple[int, LazyRoute, Dict[str, Any]]]) -> Optional[Tuple[int, LazyRoute, Dict[str, Any]]]:
+        if index == len(segments):
+            # Routes are appended in registration order, so the first one is the best candidate here
+            if node.routes and (best is None or node.routes[0][0] < best[0]):
+                order, route = node.routes[0]
+                return order, route, dict(params)
+            return best
+
+        segment = segments[index]
+        child = node.static.get(segment)
+        if child is not None and (best is None or child.min_order < best[0]):
+            best = self._search(child, segments, index + 1, params, best)
+
+        if segment:
+            for converter, name, child in node.params:
+                if best is not None and child.min_order >= best[0]:
+                    continue
+                if not converter.pattern.fullmatch(segment):
+                    continue
+                try:
+                    params[name] = converter.to_python(segment)
+                except ValueError:
+                    continue
+                best = self._search(child, segments, index + 1, params, best)
+                del params[name]
+        return best
+
+    @staticmethod
+    def _touch(node: _TrieNode, order: int) -> None:
+        if node.min_order is None:
+            node.min_order = order
+
+    @staticmethod
+    def _param_child(node: _TrieNode, converter: Converter, name: str) -> _TrieNode:
+        for existing_converter, existing_name, child in node.params:
+            if existing_converter is converter and existing_name == name:
+                return child
+        child = _TrieNode()
+        node.params.append((converter, name, child))
+        return child
+
+    # Splits a route path into literal segments and (converter, name) parameter segments.
+    # Returns None when a segment cannot be represented in the trie.
+    @staticmethod
+    def _parse(route: LazyRoute) -> Optional[List[Any]]:
+        segments = []
+        for segment in route.path.split('/'):
+            placeholder = PLACEHOLDER_PATTERN.fullmatch(segment)
+            if placeholder:
+                converter = route.converters[placeholder.group(2)]
+                if not converter.single_segment:
+                    return None
+                segments.append((converter, placeholder.group(2)))
+            elif REGEX_SPECIAL_CHARACTERS.intersection(segment):
+                return None
+            else:
+                segments.append(segment)
+        return segments
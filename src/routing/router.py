@@ -1,35 +1,174 @@
-from typing import List, Optional, Type, Union, Callable, Tuple, Dict
+from typing import Any, Iterable, List, Optional, Type, Union, Callable, Tuple, Dict
 
+from src.cache.lru_cache import LRUCache
 from src.core.request import Request
 from src.core.response import Response
 from src.routing.lazy_route import LazyRoute
+from src.routing.alternation_matcher import AlternationRouteMatcher
+from src.routing.route_matcher import RouteMatcher, RouteMatch, LinearRouteMatcher
+from src.routing.route_trie import RouteTrie
 from src.core.view import View
+from src.logger.logger import get_logger
 
 HandlerType = Union[Type[View], Callable[..., Response]]
 
+# Route matching strategies selectable by name (see the ROUTER_ENGINE configuration key)
+ROUTE_MATCHERS = {
+    'trie': RouteTrie,
+    'alternation': AlternationRouteMatcher,
+    'linear': LinearRouteMatcher,
+}
+
+logger = get_logger(__name__)
+
+# Cached value for paths that matched no route, so repeated 404s skip the matcher too
+NO_MATCH = object()
+
 
 class Router:
-    def __init__(self):
+    def __init__(self, cache_size: int = 0, engine: str = None):
         self.routes: List[LazyRoute] = []
+        if engine is None:
+            engine = 'trie'
+        if engine not in ROUTE_MATCHERS:
+            raise ValueError(f"Unknown router engine: {engine}")
+        self.matcher_cls: Type[RouteMatcher] = ROUTE_MATCHERS[engine]
+        # One matching index per method, built as routes are registered, so a request only ever looks at
+        # the routes of its own method and match() never scans self.routes
+        self.matchers: Dict[str, RouteMatcher] = {}
+        # Exact-match index for parameterless routes, checked before the matcher
+        self.static_routes: Dict[Tuple[str, str], LazyRoute] = {}
+        # Routes by name, used to build URLs; the first route registered under a name keeps it
+        self.named_routes: Dict[str, LazyRoute] = {}
+        # Optional memo of (method, path) -> match result, misses included
+        self.cache: Optional[LRUCache] = LRUCache(max_size=cache_size) if cache_size > 0 else None
+        self.frozen = False
 
     def add_routes(self, routes: List[Tuple[str, HandlerType, List[str]]]) -> None:
         for path, handler, methods in routes:
             self.add_route(path, handler, methods)
 
-    def add_route(self, path: str, module_dir: str, handler: HandlerType, methods: List[str]) -> None:
-        self.routes.append(LazyRoute(path, module_dir=module_dir, handler_factory=lambda: handler, methods=methods))
+    def add_route(self, path: str, module_dir: str, handler: HandlerType, methods: List[str],
+                  name: Optional[str] = None) -> None:
+        if self.frozen:
+            raise RuntimeError(f"Cannot add route '{path}', the router is frozen")
+        route = LazyRoute(path, module_dir=module_dir, handler_factory=lambda: handler, methods=methods, name=name)
+        if name is not None:
+            self.named_routes.setdefault(name, route)
+        for method in route.methods:
+            matcher = self.matchers.get(method)
+            if matcher is None:
+                matcher = self.matchers[method] = self.matcher_cls()
+            # A route registered earlier that already matches this path keeps precedence,
+            # so the path is only indexed when nothing else claims it yet
+            key = (method, path)
+            if route.is_static and key not in self.static_routes and matcher.match(path) is None:
+                self.static_routes[key] = route
+            matcher.add(route)
+        self.routes.append(route)
+        # Routes added after startup (e.g. by plugins) may change the result for any cached path
+        if self.cache is not None:
+            self.cache.clear()
 
     def match(self, path: str, method: str) -> Tuple[Optional[HandlerType], Dict[str, str]]:
         # Strip query parameters from the path
         path = path.split('?')[0]
-        for route in self.routes:
-            match = route.match(path, method)
-            if match:
-                print(f"Route matched: {route.path}")
-                return match
-        print("No route matched")
+        route = self.static_routes.get((method, path))
+        if route is not None:
+            logger.debug("Route matched", path=route.path)
+            return route.handler, {}
+        match = self._match_dynamic(path, method)
+        if match:
+            route, params = match
+            logger.debug("Route matched", path=route.path)
+            return route.handler, params
+        logger.debug("No route matched", path=path)
         return None, {}
 
+    def _match_dynamic(self, path: str, method: str) -> Optional[RouteMatch]:
+        matcher = self.matchers.get(method)
+        if matcher is None:
+            return None
+        if self.cache is None:
+            return matcher.match(path)
+
+        key = (method, path)
+        match = self.cache.get(key)
+        if match is None:
+            match = matcher.match(path)
+            self.cache.set(key, match if match is not None else NO_MATCH)
+        elif match is NO_MATCH:
+            return None
+        else:
+            # Handlers receive the params as keyword arguments, but never hand out the cached dict itself
+            match = match[0], dict(match[1])
+        return match
+
+    # Methods that have a route for the path, used to answer 405 and OPTIONS requests.
+    # HEAD is implied by GET and OPTIONS is always answered.
+    # Memoized in the route cache under (None, path), so a repeated 404 does not scan every method's matcher.
+    def allowed_methods(self, path: str) -> List[str]:
+        path = path.split('?')[0]
+        if self.cache is None:
+            return list(self._allowed_methods(path))
+        key = (None, path)
+        allowed = self.cache.get(key)
+        if allowed is None:
+            allowed = self._allowed_methods(path)
+            self.cache.set(key, allowed)
+        return list(allowed)
+
+    def _allowed_methods(self, path: str) -> Tuple[str, ...]:
+        allowed = {method for method, matcher in self.matchers.items()
+                   if (method, path) in self.static_routes or matcher.match(path) is not None}
+        if not allowed:
+            return ()
+        if 'GET' in allowed:
+            allowed.add('HEAD')
+        allowed.add('OPTIONS')
+        return tuple(sorted(allowed))
+
+    def url_for(self, name: str, params: Dict[str, Any]) -> str:
+        return self._get_named_route(name).build_url(params)
+
+    def urls_for(self, name: str, params_list: Iterable[Dict[str, Any]]) -> List[str]:
+        return self._get_named_route(name).build_urls(params_list)
+
+    def _get_named_route(self, name: str) -> LazyRoute:
+        route = self.named_routes.get(name)
+        if route is None:
+            raise ValueError(f"No route named '{name}'")
+        return route
+
+    # Resolves every lazy handler and builds every matching index, then rejects new routes
+    def freeze(self) -> None:
+        for route in self.routes:
+            route.handler
+        for matcher in self.matchers.values():
+            matcher.compile()
+        self.frozen = True
+
+    # One entry per route, in registration order, for diagnostics
+    def route_table(self) -> List[Dict[str, Any]]:
+        table = []
+        for route in self.routes:
+            table.append({
+                'path': route.path,
+                'methods': list(route.methods),
+                'name': route.name,
+                'module_dir': route.module_dir,
+                'static': all((method, route.path) in self.static_routes
+                              and self.static_routes[(method, route.path)] is route for method in route.methods),
+                'params': {name: type(converter).__name__ for name, converter in route.converters.items()},
+            })
+        return table
+
+    def cache_info(self) -> Dict[str, int]:
+        if self.cache is None:
+            return {'hits': 0, 'misses': 0, 'size': 0, 'max_size': 0}
+        return {'hits': self.cache.hits, 'misses': self.cache.misses, 'size': len(self.cache),
+                'max_size': self.cache.max_size}
+
     def get_module_dir(self, path: str) -> Optional[str]:
         for route, module_dir, handler, methods in self.routes:
             if path == route:
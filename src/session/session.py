@@ -6,6 +6,9 @@ from src.config import config
 
 
 class Session:
+    __slots__ = ('id', 'signed_id', 'user_id', 'created_at', 'last_accessed', 'expiry_time', 'ip_address',
+                 'user_agent', 'csrf_token', 'data')
+
     def __init__(self, user_id: str, expiry_time: Optional[float] = None, ip_address: Optional[str] = None,
                  user_agent: Optional[str] = None, csrf_token: Optional[str] = None):
         self.id = str(uuid.uuid4())
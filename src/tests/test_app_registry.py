@@ -4,6 +4,8 @@ import sys
 
 from src.app import App
 from src.app_registry import AppRegistry
+from src.core.response import Response
+from src.middleware.middleware import Middleware
 
 
 @pytest.fixture
@@ -77,3 +79,31 @@ def test_create_module(app_registry, monkeypatch):
     dummy_app_context2 = dummy_app2.get_context()
     dummy_app_config2 = dummy_app_context2.get_config()
     assert dummy_app_config2.SECRET_KEY == 'dummy-app-secret-key'
+
+
+def test_freeze_all(app_registry, monkeypatch):
+    monkeypatch.setattr(AppRegistry, '_get_app_base_dir', lambda self, name: "/fake/path")
+    app = app_registry.create_app('frozen_app')
+
+    @app.route('/user/<int:id>', methods=['GET'])
+    def get_user(request_context, id):
+        return Response(body=[f'User {id}'.encode()])
+
+    app.use_middleware(Middleware)
+    app.before_request(lambda: None)
+    app_registry.freeze_all()
+
+    assert app.frozen
+    assert isinstance(app.middlewares, tuple)
+    assert isinstance(app.hooks.before_request_hooks, tuple)
+    assert 'get_user' in app.dump_routes()
+    assert app.router.route_table()[0]['params'] == {'id': 'IntConverter'}
+
+    with pytest.raises(RuntimeError):
+        app.route('/late')(lambda request_context: Response())
+    with pytest.raises(RuntimeError):
+        app.use_middleware(Middleware)
+    with pytest.raises(RuntimeError):
+        app.after_request(lambda: None)
+    with pytest.raises(RuntimeError):
+        app.router.add_route('/late', 'module_dir', lambda request_context: Response(), methods=['GET'])
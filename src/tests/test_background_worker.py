@@ -2,6 +2,7 @@ import time
 import pytest
 
 from src.background_worker import BackgroundWorker
+from src.core.health import background_worker_check
 
 
 def test_background_worker():
@@ -88,3 +89,12 @@ def test_background_worker_timeout():
 
     # Check that the task eventually completed even after the timeout
     assert result == [] or result == ["long task"], "Unexpected task completion after timeout"
+
+
+def test_background_worker_readiness_check():
+    worker = BackgroundWorker()
+    check = background_worker_check(worker, max_queue_depth=1)
+    assert check()
+
+    worker.wait_for_completion()
+    assert not check(), "A stopped worker must not report ready"
@@ -1,6 +1,13 @@
 import time
+from hashlib import md5
+from unittest.mock import MagicMock
 
+from src.cache.cache_decorator import cache_view
 from src.cache.simple_cache import SimpleCache
+from src.cache.lru_cache import LRUCache
+from src.core.request import Request
+from src.core.request_context import RequestContext
+from src.core.response import Response
 
 
 def test_cache_set_and_get():
@@ -22,3 +29,38 @@ def test_cache_with_timeout():
     assert cache.get('key') == 'value', "Cache should return the stored value"
     time.sleep(2)
     assert cache.get('key') is None, "Cache should expire after the timeout"
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(max_size=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1  # 'a' is now the most recently used
+    cache.set('c', 3)
+    assert cache.get('b') is None, "Least recently used entry should be evicted"
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert len(cache) == 2
+
+
+def test_lru_cache_counts_hits_and_misses():
+    cache = LRUCache(max_size=2)
+    cache.set('key', 'value')
+    cache.get('key')
+    cache.get('missing')
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_view_matches_the_weak_etag_of_compressed_variants():
+    @cache_view(timeout=60)
+    def view(request_context):
+        return Response(body=[b'<p>', b'cached page</p>'])
+
+    def request_context(**headers):
+        environ = {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/cached', **headers}
+        return RequestContext(Request(environ), MagicMock())
+
+    etag = view(request_context()).headers_dict['ETag']
+    assert etag == '"%s"' % md5(b'<p>cached page</p>').hexdigest()
+    assert view(request_context(HTTP_IF_NONE_MATCH=f'W/{etag}')).status_code == 304
+    assert view(request_context(HTTP_IF_NONE_MATCH='"other"')).status_code == 200
@@ -1,3 +1,5 @@
+import io
+import json
 from typing import Dict, Any, Optional, List, Tuple
 from src.app import App
 from src.core.app_context import AppContext
@@ -13,6 +15,7 @@ class FrameworkTestClient:
     def _make_request(self, method: str, path: str, data: Optional[Dict[str, Any]] = None,
                       headers: Optional[Dict[str, str]] = None) -> Response:
         query_string = ''
+        body = json.dumps(data).encode() if data is not None else b''
         if '?' in path:
             path, query_string = path.split('?', 1)
 
@@ -20,8 +23,8 @@ class FrameworkTestClient:
             'REQUEST_METHOD': method,
             'PATH_INFO': path,
             'QUERY_STRING': query_string,
-            'wsgi.input': data or b'',
-            'CONTENT_LENGTH': str(len(data or b'')),
+            'wsgi.input': io.BytesIO(body),
+            'CONTENT_LENGTH': str(len(body)),
             'CONTENT_TYPE': 'application/json',
         }
 
@@ -30,7 +33,12 @@ class FrameworkTestClient:
                 environ[f'HTTP_{header.upper().replace("-", "_")}'] = value
 
         response_iterable = self.app(environ, self._start_response)
-        response_body = b''.join(response_iterable)
+        try:
+            response_body = b''.join(response_iterable)
+        finally:
+            # Like a WSGI server, closing the body releases the request
+            if hasattr(response_iterable, 'close'):
+                response_iterable.close()
         response = Response(status=self.response_status, headers=self.response_headers, body=response_body)
         return response
 
@@ -0,0 +1,104 @@
+import gzip
+import zlib
+
+import pytest
+
+from src.app import App
+from src.core.request import Request
+from src.core.request_context import RequestContext
+from src.core.response import Response, StreamingResponse
+from src.middleware.compression_middleware import CompressionMiddleware, negotiate_encoding
+
+BODY = b'<p>Hello, compressed world!</p>' * 100
+
+
+def make_request_context(accept_encoding=None):
+    environ = {'REQUEST_METHOD': 'GET', 'PATH_INFO': '/'}
+    if accept_encoding is not None:
+        environ['HTTP_ACCEPT_ENCODING'] = accept_encoding
+    return RequestContext(Request(environ), App(name='test_app').get_context())
+
+
+@pytest.fixture
+def middleware():
+    return CompressionMiddleware(encodings=('gzip', 'deflate'))
+
+
+def test_negotiate_encoding():
+    encodings = ('br', 'gzip', 'deflate')
+    assert negotiate_encoding('gzip, deflate', encodings) == 'gzip'
+    assert negotiate_encoding('gzip;q=0.5, deflate', encodings) == 'deflate'
+    assert negotiate_encoding('br;q=0, *', encodings) == 'gzip'
+    assert negotiate_encoding('identity', encodings) is None
+    assert negotiate_encoding('', encodings) is None
+
+
+def test_compresses_body_with_the_accepted_encoding(middleware):
+    response = Response(body=BODY, headers=[('Content-Type', 'text/html'), ('Content-Length', str(len(BODY)))])
+    compressed = middleware.after_request(make_request_context('gzip'), response)
+    assert gzip.decompress(b''.join(compressed)) == BODY
+    assert compressed.headers_dict['Content-Encoding'] == 'gzip'
+    assert compressed.headers_dict['Content-Length'] == str(len(b''.join(compressed)))
+    assert compressed.headers_dict['Vary'] == 'Accept-Encoding'
+
+    compressed = middleware.after_request(make_request_context('deflate'), response)
+    assert zlib.decompress(b''.join(compressed)) == BODY
+    # The original response is left untouched
+    assert b''.join(response) == BODY
+    assert 'Content-Encoding' not in response.headers
+
+
+def test_skips_small_compressed_and_unaccepted_responses(middleware):
+    small = Response(body=b'tiny', headers=[('Content-Type', 'text/plain')])
+    assert middleware.after_request(make_request_context('gzip'), small) is small
+
+    image = Response(body=BODY, headers=[('Content-Type', 'image/png')])
+    assert middleware.after_request(make_request_context('gzip'), image) is image
+
+    response = Response(body=BODY, headers=[('Content-Type', 'text/html'), ('Vary', 'Cookie')])
+    uncompressed = middleware.after_request(make_request_context(), response)
+    assert b''.join(uncompressed) == BODY
+    assert uncompressed.headers_dict['Vary'] == 'Cookie, Accept-Encoding'
+    assert response.headers_dict['Vary'] == 'Cookie'
+
+
+def test_compresses_streaming_bodies_chunk_by_chunk(middleware):
+    closed = []
+
+    def chunks():
+        try:
+            for _ in range(10):
+                yield BODY
+        finally:
+            closed.append(True)
+
+    response = StreamingResponse(chunks(), headers=[('Content-Type', 'application/json')])
+    compressed = middleware.after_request(make_request_context('gzip'), response)
+    parts = list(compressed)
+    # Every chunk is flushed as soon as it is compressed
+    assert len(parts) == 11
+    assert gzip.decompress(b''.join(parts)) == BODY * 10
+    assert 'Content-Length' not in compressed.headers
+    assert closed == [True]
+
+
+def test_compressed_bodies_of_cached_responses_are_reused(middleware):
+    response = Response(body=BODY, headers=[('Content-Type', 'text/html'), ('ETag', '"abc"')])
+    first = middleware.after_request(make_request_context('gzip'), response)
+    second = middleware.after_request(make_request_context('gzip'), response)
+    assert first.body[0] is second.body[0]
+    assert middleware.cache.hits == 1
+    assert second.headers_dict['ETag'] == 'W/"abc"'
+    assert response.headers_dict['ETag'] == '"abc"'
+
+
+def test_responses_sharing_an_etag_keep_their_own_body(middleware):
+    for body in (b'a' * 600, b'b' * 600):
+        response = Response(body=body, headers=[('Content-Type', 'text/plain'), ('ETag', '"v1"')])
+        compressed = middleware.after_request(make_request_context('gzip'), response)
+        assert gzip.decompress(b''.join(compressed)) == body
+
+
+def test_small_generator_body_is_not_lost(middleware):
+    response = Response(body=(chunk for chunk in [b'hello ', b'world']), headers=[('Content-Type', 'text/plain')])
+    assert b''.join(middleware.after_request(make_request_context('gzip'), response)) == b'hello world'
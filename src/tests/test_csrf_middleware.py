@@ -1,3 +1,5 @@
+import io
+
 import pytest
 
 from unittest.mock import MagicMock
@@ -54,18 +56,18 @@ def test_generate_csrf_token(csrf_middleware):
     assert token != ''
 
 
-def test_before_request_valid_token(csrf_middleware, request_context):
+def test_before_request_valid_token(csrf_middleware, request_context, monkeypatch):
     csrf = CSRFToken("")
     token = csrf.generate_csrf_token(request_context.session_context.id)
-    request_context.get_form_data = MagicMock(return_value={'csrf_token': token})
+    monkeypatch.setattr(RequestContext, 'get_form_data', MagicMock(return_value={'csrf_token': token}))
     response = csrf_middleware.before_request(request_context)
     assert response is None
 
 
 @pytest.mark.parametrize("method", ['POST', 'PUT', 'PATCH', 'DELETE'])
-def test_before_request_invalid_token(csrf_middleware, request_context, method):
+def test_before_request_invalid_token(csrf_middleware, request_context, method, monkeypatch):
     request_context.request.environ = {'REQUEST_METHOD': method}
-    request_context.get_form_data = MagicMock(return_value={'csrf_token': 'invalid_token'})
+    monkeypatch.setattr(RequestContext, 'get_form_data', MagicMock(return_value={'csrf_token': 'invalid_token'}))
     response = csrf_middleware.before_request(request_context)
     assert isinstance(response, Response)
     assert b"".join(response.body) == b"Invalid CSRF Token"  # Join the body parts for the assertion
@@ -77,3 +79,31 @@ def test_after_request_adds_csrf_token(csrf_middleware, request_context, respons
     response = csrf_middleware.after_request(request_context, response)
     headers = dict(response.headers)
     assert 'X-CSRF-Token' in headers
+
+
+def json_request_context(session_context, headers=None):
+    environ = {'REQUEST_METHOD': 'POST', 'CONTENT_TYPE': 'application/json', 'CONTENT_LENGTH': '2',
+               'wsgi.input': io.BytesIO(b'{}'), **(headers or {})}
+    request_context = RequestContext(request=Request(environ), app_context=MagicMock())
+    request_context.session_context = session_context
+    return request_context
+
+
+def test_json_post_without_token_is_rejected(csrf_middleware, session_context):
+    response = csrf_middleware.before_request(json_request_context(session_context))
+    assert isinstance(response, Response)
+    assert response.status == '403 Forbidden'
+
+
+def test_json_post_with_token_header_is_accepted(csrf_middleware, session_context):
+    token = CSRFToken(Config.SECRET_KEY).generate_csrf_token(session_context.id)
+    request_context = json_request_context(session_context, {'HTTP_X_CSRF_TOKEN': token})
+    assert csrf_middleware.before_request(request_context) is None
+
+
+def test_json_exemption_is_opt_in(session_context):
+    class ExemptConfig(Config):
+        CSRF_EXEMPT_JSON = True
+
+    csrf_middleware = CSRFMiddleware(ExemptConfig())
+    assert csrf_middleware.before_request(json_request_context(session_context)) is None
@@ -0,0 +1,203 @@
+import json
+import time
+
+import pytest
+
+from src.app import App
+from src.core.app_context import AppContext
+from src.core.dispatcher import Dispatcher
+from src.core.prebuilt_response import NOT_FOUND
+from src.core.request_context import RequestContext
+from src.core.response import Response
+from src.middleware.request_id_middleware import RequestIDMiddleware
+from src.middleware.wsgi_middleware import WSGIMiddleware
+
+
+def make_app(name: str) -> App:
+    app = App(name)
+    app.set_context(AppContext())
+
+    @app.route('/')
+    def index(request_context: RequestContext) -> Response:
+        return Response(body=[f'{name}:index'.encode()])
+
+    @app.route('/<path:rest>')
+    def echo(request_context: RequestContext, rest: str) -> Response:
+        environ = request_context.request.environ
+        return Response(body=[f"{name}:{environ.get('SCRIPT_NAME', '')}|{environ['PATH_INFO']}".encode()])
+
+    return app
+
+
+@pytest.fixture
+def dispatcher():
+    dispatcher = Dispatcher()
+    dispatcher.add_app('/admin', make_app('admin'))
+    dispatcher.add_app('/', make_app('root'))
+    dispatcher.add_app('/admin/reports', make_app('reports'))
+    return dispatcher
+
+
+def call(dispatcher: Dispatcher, path: str) -> bytes:
+    environ = {'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': ''}
+    return b''.join(dispatcher(environ, lambda status, headers, exc_info=None: None))
+
+
+def call_with_status(dispatcher: Dispatcher, path: str, **environ):
+    environ.update({'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': ''})
+    started = {}
+
+    def start_response(status, headers, exc_info=None):
+        started.update(status=status, headers=dict(headers))
+
+    body = b''.join(dispatcher(environ, start_response))
+    return started['status'], started['headers'], body
+
+
+def test_longest_prefix_wins(dispatcher):
+    assert call(dispatcher, '/') == b'root:index'
+    assert call(dispatcher, '/admin') == b'admin:index'
+    assert call(dispatcher, '/admin/') == b'admin:index'
+    assert call(dispatcher, '/admin/reports') == b'reports:index'
+
+
+def test_mounts_are_segment_aware(dispatcher):
+    assert call(dispatcher, '/administrator') == b'root:|/administrator'
+    assert call(dispatcher, '/admin/x') == b'admin:/admin|/x'
+    assert call(dispatcher, '/admin/reports/a/b') == b'reports:/admin/reports|/a/b'
+
+
+def test_unmounted_path_is_not_found():
+    dispatcher = Dispatcher()
+    dispatcher.add_app('/admin', make_app('admin'))
+    assert call(dispatcher, '/other') == b'Not Found'
+
+
+def test_url_for_includes_mount_point(dispatcher):
+    assert dispatcher.apps['/admin'].url_for('echo', rest='a/b') == '/admin/a/b'
+    assert dispatcher.apps['/'].url_for('index') == '/'
+
+
+def test_request_context_carries_the_app_without_global_writes():
+    app = App('admin')
+    app.set_context(AppContext())
+    dispatcher = Dispatcher()
+    dispatcher.add_app('/admin', app)
+    seen = {}
+    app_name_before = app.context.get_current_app_name()
+
+    @app.route('/whoami')
+    def whoami(request_context: RequestContext) -> Response:
+        seen['app'] = request_context.current_app
+        seen['module_dir'] = request_context.current_module_dir
+        seen['app_name'] = app.context.get_current_app_name()
+        return Response(body=[b'ok'])
+
+    assert call(dispatcher, '/admin/whoami') == b'ok'
+    assert seen['app'] is app
+    assert seen['app_name'] == 'admin'
+    assert seen['module_dir'] is not None
+    # Nothing leaks out of the request once it has been handled
+    assert app.context.get_current_app_name() == app_name_before
+
+
+def test_unmounted_path_reuses_prebuilt_response():
+    dispatcher = Dispatcher()
+    dispatcher.add_app('/admin', make_app('admin'))
+    status, headers, body = call_with_status(dispatcher, '/other')
+    assert status == '404 Not Found'
+    assert headers['Content-Length'] == '9'
+    # Headers handed to the server are a fresh list, the prebuilt ones are never mutated
+    assert call_with_status(dispatcher, '/other') == (status, headers, body)
+
+
+def test_favicon_without_file_is_empty():
+    status, headers, body = call_with_status(Dispatcher(), '/favicon.ico')
+    assert status == '204 No Content'
+    assert body == b''
+
+
+def test_favicon_is_served_from_memory_with_etag(tmp_path):
+    favicon = tmp_path / 'favicon.ico'
+    favicon.write_bytes(b'icon-bytes')
+    dispatcher = Dispatcher(favicon_path=str(favicon))
+    favicon.unlink()  # read once at construction
+
+    status, headers, body = call_with_status(dispatcher, '/favicon.ico')
+    assert status == '200 OK'
+    assert body == b'icon-bytes'
+    assert headers['Content-type'].startswith('image/')
+    etag = headers['ETag']
+
+    status, headers, body = call_with_status(dispatcher, '/favicon.ico', HTTP_IF_NONE_MATCH=f'"other", W/{etag}')
+    assert status == '304 Not Modified'
+    assert headers['ETag'] == etag
+    assert body == b''
+
+
+def test_dispatcher_middlewares_wrap_dispatch_in_registration_order(dispatcher):
+    calls = []
+
+    class Recorder(WSGIMiddleware):
+        def __init__(self, app, label):
+            super().__init__(app)
+            self.label = label
+
+        def __call__(self, environ, start_response):
+            calls.append(self.label)
+            if environ['PATH_INFO'] == '/short':
+                return NOT_FOUND(environ, start_response)
+            return self.app(environ, start_response)
+
+    dispatcher.use(Recorder, 'outer')
+    dispatcher.use(Recorder, label='inner')
+    assert call(dispatcher, '/admin') == b'admin:index'
+    assert calls == ['outer', 'inner']
+
+    calls.clear()
+    assert call(dispatcher, '/short') == b'Not Found'
+    assert calls == ['outer']
+
+
+def test_request_id_middleware(dispatcher):
+    dispatcher.use(RequestIDMiddleware)
+    status, headers, body = call_with_status(dispatcher, '/admin', HTTP_X_REQUEST_ID='lb-1234')
+    assert headers['X-Request-ID'] == 'lb-1234'
+
+    status, headers, body = call_with_status(dispatcher, '/admin', HTTP_X_REQUEST_ID='bad id\r\n')
+    assert headers['X-Request-ID'] != 'bad id\r\n'
+    assert len(headers['X-Request-ID']) == 32
+
+
+def test_health_probes_bypass_the_apps(dispatcher):
+    assert call_with_status(dispatcher, '/healthz') == ('200 OK', {'Content-type': 'text/plain',
+                                                                   'Cache-Control': 'no-store',
+                                                                   'Content-Length': '2'}, b'ok')
+    status, headers, body = call_with_status(dispatcher, '/readyz')
+    assert status == '200 OK'
+    assert json.loads(body) == {'status': 'ready', 'checks': {}}
+
+
+def test_readiness_checks_are_cached(monkeypatch):
+    dispatcher = Dispatcher(readiness_cache_ttl=10)
+    outcomes = [True, False]
+    calls = []
+
+    def check():
+        calls.append(1)
+        return outcomes[len(calls) - 1]
+
+    dispatcher.add_readiness_check('database', check)
+    dispatcher.add_readiness_check('broken', lambda: 1 / 0)
+    status, headers, body = call_with_status(dispatcher, '/readyz')
+    assert status == '503 Service Unavailable'
+    assert json.loads(body)['checks'] == {'database': 'ok', 'broken': 'failed'}
+    call_with_status(dispatcher, '/readyz')
+    assert len(calls) == 1
+
+    # Once the interval has passed the checks run again
+    monotonic = time.monotonic() + 11
+    monkeypatch.setattr('src.core.health.time.monotonic', lambda: monotonic)
+    status, headers, body = call_with_status(dispatcher, '/readyz')
+    assert len(calls) == 2
+    assert json.loads(body)['checks']['database'] == 'failed'
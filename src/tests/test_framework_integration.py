@@ -1,8 +1,10 @@
+import io
+
 import pytest
 from src.app import App
 from src.tests.test_client import FrameworkTestClient
 from src.core.request_context import RequestContext
-from src.core.response import Response
+from src.core.response import Response, StreamingResponse
 from user_app.modules.user_module.middleware.logging_middleware import LoggingMiddleware
 from src.core.view import View
 from typing import Dict, Any
@@ -19,6 +21,21 @@ def client(app):
     return FrameworkTestClient(app)
 
 
+@pytest.fixture
+def debug_client():
+    return FrameworkTestClient(App("test_app", debug=True))
+
+
+def register_invalid_body_routes(app: App) -> None:
+    @app.route('/list')
+    def list_body(context: RequestContext) -> Response:
+        return Response(body=[b'ok', 'not bytes'])
+
+    @app.route('/stream')
+    def stream_body(context: RequestContext) -> Response:
+        return StreamingResponse(iter([b'ok', 'not bytes']))
+
+
 def test_client_get_request(client):
     @client.app.route('/test')
     def test_handler(request: RequestContext) -> Response:
@@ -85,3 +102,97 @@ def test_client_with_view(client):
     response = client.get('/view')
     assert response.status == '200 OK'
     assert b'Hello from View' in response.body
+
+
+def test_client_url_for(client):
+    @client.app.route('/greet/<name>')
+    def greet_handler(context: RequestContext, name: str) -> Response:
+        return Response(status='200 OK', body=[f'Hello {name}'.encode()])
+
+    @client.app.route('/user/<int:id>', name='user_detail')
+    def user_handler(context: RequestContext, id: int) -> Response:
+        return Response(status='200 OK', body=[f'User {id + 1}'.encode()])
+
+    assert client.app.url_for('greet_handler', name='Jane') == '/greet/Jane'
+    response = client.get(client.app.url_for('user_detail', id=41))
+    assert b'User 42' in response.body
+
+
+def test_client_method_not_allowed(client):
+    @client.app.route('/items', methods=['GET', 'POST'])
+    def items_handler(context: RequestContext) -> Response:
+        return Response(status='200 OK', body=[b'Items'])
+
+    response = client._make_request('DELETE', '/items')
+    assert response.status == '405 Method Not Allowed'
+    assert response.headers_dict['Allow'] == 'GET, HEAD, OPTIONS, POST'
+
+    response = client._make_request('DELETE', '/missing')
+    assert response.status == '404 Not Found'
+
+
+def test_client_automatic_options_and_head(client):
+    calls = []
+
+    @client.app.route('/items')
+    def items_handler(context: RequestContext) -> Response:
+        calls.append(context.method)
+        return Response(status='200 OK', body=[b'Items'])
+
+    response = client._make_request('OPTIONS', '/items')
+    assert response.status == '204 No Content'
+    assert response.headers_dict['Allow'] == 'GET, HEAD, OPTIONS'
+
+    response = client._make_request('HEAD', '/items')
+    assert response.status == '200 OK'
+    assert response.body == [b'']
+    assert calls == []
+
+
+def test_request_body_over_max_content_length():
+    app = App('test_app', max_content_length=16)
+    client = FrameworkTestClient(app)
+
+    @app.route('/echo', methods=['POST'])
+    def echo(context: RequestContext) -> Response:
+        return Response(body=[context.body, context.body])
+
+    assert client.post('/echo', data={'a': 1}).body == [b'{"a": 1}{"a": 1}']
+    response = client.post('/echo', data={'key': 'a longer value'})
+    assert response.status == '413 Request Entity Too Large'
+
+
+def test_request_body_too_large_while_streaming_the_response():
+    app = App('test_app', max_content_length=16)
+
+    @app.route('/echo', methods=['POST'])
+    def echo(context: RequestContext) -> Response:
+        # Read while the response is sent, without Content-Length the limit is only hit then
+        return StreamingResponse(context.iter_body(chunk_size=32))
+
+    environ = {'REQUEST_METHOD': 'POST', 'PATH_INFO': '/echo', 'wsgi.input_terminated': True,
+               'wsgi.input': io.BytesIO(b'x' * 64)}
+    started = []
+    body = app(environ, lambda status, headers, exc_info=None: started.append(status))
+    try:
+        assert b''.join(body) == b'Request Entity Too Large'
+    finally:
+        body.close()
+    assert started == ['200 OK', '413 Request Entity Too Large']
+
+
+def test_debug_app_validates_response_bodies(debug_client):
+    register_invalid_body_routes(debug_client.app)
+    with pytest.raises(TypeError, match='is not a byte'):
+        debug_client.get('/list')
+    with pytest.raises(TypeError, match='is not a byte'):
+        debug_client.get('/stream')
+
+
+def test_production_app_hands_bodies_over_unchecked(client):
+    register_invalid_body_routes(client.app)
+    # Only the server (here the client's b''.join) sees the invalid chunk
+    with pytest.raises(TypeError, match='expected a bytes-like object'):
+        client.get('/list')
+    with pytest.raises(TypeError, match='expected a bytes-like object'):
+        client.get('/stream')
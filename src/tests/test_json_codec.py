@@ -0,0 +1,32 @@
+import pytest
+
+from src.core.response import JSONResponse
+from src.http import json_codec
+from src.http.json_response_builder import JSONResponseBuilder
+
+
+@pytest.mark.parametrize('name', json_codec.available_codecs())
+def test_codecs_round_trip_to_bytes(name):
+    codec = json_codec.create_codec(name)
+    data = {'name': 'Zoë', 'ids': [1, 2], 'nested': {'ok': True, 'none': None}}
+    encoded = codec.dumps(data)
+    assert isinstance(encoded, bytes)
+    assert codec.loads(encoded) == data
+    with pytest.raises(ValueError):
+        codec.loads(b'{invalid')
+
+
+def test_unknown_codec():
+    with pytest.raises(ValueError):
+        json_codec.create_codec('simdjson')
+
+
+def test_json_response_uses_configured_codec(monkeypatch):
+    monkeypatch.setattr(json_codec, 'codec', json_codec.create_codec('json'))
+    response = JSONResponse({'message': 'Hello'}, status=201)
+    assert response.status == '201 Created'
+    assert response.headers_dict['Content-Type'] == 'application/json'
+    assert b''.join(response) == b'{"message":"Hello"}'
+
+    response = JSONResponseBuilder().set_body([1, 2]).build()
+    assert b''.join(response) == b'[1,2]'
@@ -0,0 +1,106 @@
+import logging
+import os
+import queue
+import threading
+import pytest
+
+from src.config import config
+from src.logger import logger as logger_module
+from src.logger.logger import (get_logger, configure_logging, default_handler, dropped_records, shutdown_logging,
+                               StructuredFormatter)
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(self.format(record))
+
+
+@pytest.fixture
+def handler():
+    handler = ListHandler()
+    handler.setFormatter(StructuredFormatter('%(levelname)s %(message)s'))
+    yield handler
+    shutdown_logging()
+    configure_logging(debug=config.DEBUG, handler=default_handler())
+
+
+def test_debug_is_a_noop_when_debug_is_off(handler):
+    configure_logging(debug=False, handler=handler)
+    logger = get_logger('test_noop')
+    logger.debug("Route matched", path='/test')
+    logger.info("Started")
+    shutdown_logging()  # Drains the queue
+
+    assert handler.messages == ["INFO Started"]
+
+
+def test_structured_debug_records_when_debug_is_on(handler):
+    logger = get_logger('test_debug')
+    configure_logging(debug=True, handler=handler)
+    logger.debug("Route matched", path='/test', method='GET')
+    shutdown_logging()
+
+    assert handler.messages == ["DEBUG Route matched path='/test' method='GET'"]
+
+
+def test_forked_process_starts_its_own_listener(handler, tmp_path):
+    path = tmp_path / 'child.log'
+    logger = get_logger('test_fork')
+    configure_logging(debug=False, handler=logging.FileHandler(path))
+    logger.info("Parent")  # The parent's listener thread is running
+
+    pid = os.fork()
+    if pid == 0:
+        try:
+            logger.info("Child")
+            shutdown_logging()
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+    shutdown_logging()
+
+    assert path.read_text().splitlines() == ["Parent", "Child"]
+
+
+def test_records_are_dropped_when_the_queue_is_full(handler, monkeypatch):
+    release = threading.Event()
+
+    class BlockingHandler(logging.Handler):
+        def emit(self, record):
+            release.wait()
+
+    monkeypatch.setattr(logger_module._queue_handler, 'queue', queue.Queue(1))
+    logger = get_logger('test_drop')
+    configure_logging(debug=False, handler=BlockingHandler())
+    dropped = dropped_records()
+    for _ in range(5):
+        logger.info("Record")
+    release.set()
+    shutdown_logging()
+
+    # One record blocked in the handler, at most one queued, the others dropped
+    assert dropped_records() - dropped >= 3
+
+
+def test_concurrent_drops_are_all_counted(monkeypatch):
+    full = queue.Queue(1)
+    full.put_nowait(None)
+    monkeypatch.setattr(logger_module._queue_handler, 'queue', full)
+    record = logging.makeLogRecord({'msg': 'Record'})
+    dropped = dropped_records()
+
+    def drop():
+        for _ in range(1000):
+            logger_module._queue_handler.enqueue(record)
+
+    threads = [threading.Thread(target=drop) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert dropped_records() - dropped == 8000
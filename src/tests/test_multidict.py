@@ -0,0 +1,49 @@
+import io
+from urllib.parse import parse_qs
+
+import pytest
+
+from src.core.request import Request
+from src.core.request_context import RequestContext
+from src.http.multidict import MultiDict, TooManyParameters, parse_params
+
+
+@pytest.mark.parametrize('query_string', ['a=1&b=2&b=3', 'a&b=&c=%20x+y&&d=%zz', 'q=caf%C3%A9&x=%E9', '=v&a=1=2'])
+def test_parse_params_matches_parse_qs(query_string):
+    assert parse_params(query_string).lists() == parse_qs(query_string)
+    assert parse_params(query_string, keep_blank_values=True).lists() == parse_qs(query_string, keep_blank_values=True)
+
+
+def test_multidict_accessors():
+    params = MultiDict([('sort', 'asc'), ('sort', 'desc'), ('page', '2'), ('debug', 'on'), ('limit', 'ten')])
+    assert params['sort'] == params.get('sort') == 'asc'
+    assert params.getlist('sort') == ['asc', 'desc']
+    assert params.getlist('missing') == []
+    assert params.get_int('page') == 2
+    assert params.get_int('limit', 10) == 10
+    assert params.get_bool('debug') is True
+    assert params.get_bool('missing', default=True) is True
+    assert dict(params) == {'sort': 'asc', 'page': '2', 'debug': 'on', 'limit': 'ten'}
+    with pytest.raises(TypeError):
+        params['page'] = '3'
+
+
+def test_parameter_cap():
+    assert len(parse_params('&'.join(f'p{i}=1' for i in range(10)), max_params=10)) == 10
+    with pytest.raises(TooManyParameters):
+        parse_params('&'.join(f'p{i}=1' for i in range(11)), max_params=10)
+
+
+def test_request_args_and_urlencoded_form():
+    body = b'tags=a&tags=b&name=John'
+    request = Request({'REQUEST_METHOD': 'POST', 'PATH_INFO': '/', 'QUERY_STRING': 'page=2&page=3',
+                       'CONTENT_TYPE': 'application/x-www-form-urlencoded', 'CONTENT_LENGTH': str(len(body)),
+                       'wsgi.input': io.BytesIO(body)})
+    assert request.args.get_int('page') == 2
+    assert request.args is request.args
+    assert request.get_query_params() == {'page': ['2', '3']}
+
+    form = RequestContext(request, None).form_data
+    assert form['tags'] == 'a'
+    assert form.getlist('tags') == ['a', 'b']
+    assert form.get('name') == 'John'
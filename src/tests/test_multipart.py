@@ -0,0 +1,99 @@
+import io
+from wsgiref.util import FileWrapper
+
+import pytest
+
+from src.app import App
+from src.core.request_context import RequestContext
+from src.core.app_context import current_request_context
+from src.core.response import Response, StreamingResponse
+from src.http.multipart import MultipartError, get_boundary, parse_multipart
+
+BODY = (b'preamble\r\n'
+        b'--XX\r\nContent-Disposition: form-data; name="title"\r\n\r\nhello\r\n'
+        b'--XX\r\nContent-Disposition: form-data; name="upload"; filename="a.txt"\r\n'
+        b'Content-Type: text/plain\r\n\r\n' + b'line\r\n--X' * 100 + b'\r\n'
+        b'--XX\r\nContent-Disposition: form-data; name="title"\r\n\r\nignored\r\n'
+        b'--XX--\r\nepilogue')
+
+
+def chunked(data: bytes, size: int):
+    return (data[i:i + size] for i in range(0, len(data), size))
+
+
+@pytest.mark.parametrize('chunk_size', [1, 3, 7, 64, len(BODY)])
+def test_parts_do_not_depend_on_chunk_boundaries(chunk_size):
+    parts = list(parse_multipart(chunked(BODY, chunk_size), b'XX', spool_threshold=100))
+    assert [(part.name, part.filename) for part in parts] == [('title', None), ('upload', 'a.txt'), ('title', None)]
+    assert parts[0].value == 'hello'
+    upload = parts[1].value
+    assert upload.content_type == 'text/plain'
+    assert upload.read() == b'line\r\n--X' * 100
+    assert upload.file._rolled  # Spooled to disk past the threshold
+
+
+def test_limits_and_malformed_bodies():
+    with pytest.raises(MultipartError):
+        list(parse_multipart(chunked(BODY, 10), b'XX', max_field_size=3))
+    with pytest.raises(MultipartError):
+        list(parse_multipart(chunked(BODY, 10), b'XX', max_parts=2))
+    with pytest.raises(MultipartError):
+        list(parse_multipart([BODY[:60]], b'XX'))
+    with pytest.raises(MultipartError):
+        get_boundary('multipart/form-data')
+    assert get_boundary('multipart/form-data; boundary="a b"') == b'a b'
+
+
+def test_total_memory_of_fields_is_limited():
+    # Every field is well under max_field_size, together they are over max_memory
+    body = b''.join(b'--XX\r\nContent-Disposition: form-data; name="f%d"\r\n\r\n' % i + b'x' * 100 + b'\r\n'
+                    for i in range(50)) + b'--XX--\r\n'
+    assert len(list(parse_multipart(chunked(body, 64), b'XX', max_memory=5000))) == 50
+    with pytest.raises(MultipartError):
+        list(parse_multipart(chunked(body, 64), b'XX', max_field_size=200, max_memory=2000))
+
+
+def test_multipart_form_data_in_app():
+    app = App('test_app')
+    seen = {}
+
+    @app.route('/upload', methods=['POST'])
+    def upload(request_context: RequestContext) -> Response:
+        seen['form'] = request_context.form_data
+        seen['file'] = request_context.files['upload'].read()
+        return Response(body=[b'ok'])
+
+    def post(body: bytes):
+        environ = {'REQUEST_METHOD': 'POST', 'PATH_INFO': '/upload', 'QUERY_STRING': '',
+                   'CONTENT_TYPE': 'multipart/form-data; boundary=XX', 'CONTENT_LENGTH': str(len(body)),
+                   'wsgi.input': io.BytesIO(body)}
+        started = []
+        b''.join(app(environ, lambda status, headers, exc_info=None: started.append(status)))
+        return started[0]
+
+    assert post(BODY) == '200 OK'
+    assert seen == {'form': {'title': 'hello'}, 'file': b'line\r\n--X' * 100}
+    assert post(BODY[:60]) == '400 Bad Request'
+
+
+@pytest.mark.parametrize('file_wrapper', [None, FileWrapper])
+def test_uploaded_file_is_streamed_after_the_app_returns(file_wrapper):
+    app = App('test_app')
+
+    @app.route('/echo', methods=['POST'])
+    def echo(request_context: RequestContext) -> Response:
+        upload = request_context.files['upload']
+        upload.file.seek(0)
+        return StreamingResponse(upload.file, block_size=16)
+
+    environ = {'REQUEST_METHOD': 'POST', 'PATH_INFO': '/echo', 'QUERY_STRING': '',
+               'CONTENT_TYPE': 'multipart/form-data; boundary=XX', 'CONTENT_LENGTH': str(len(BODY)),
+               'wsgi.input': io.BytesIO(BODY)}
+    if file_wrapper is not None:
+        environ['wsgi.file_wrapper'] = file_wrapper
+    body = app(environ, lambda status, headers, exc_info=None: None)
+    # The upload is still open while the server sends the body, and released once the body is closed
+    assert b''.join(body) == b'line\r\n--X' * 100
+    assert current_request_context.get() is not None
+    body.close()
+    assert current_request_context.get() is None
@@ -1,4 +1,9 @@
+import io
+
+import pytest
+
 from src.core.request import Request
+from src.core.request_body import RequestEntityTooLarge
 
 
 def test_request_query_params():
@@ -36,3 +41,79 @@ def test_request_query_params_single():
     query_params = request.get_query_params()
 
     assert query_params['single'] == ['param']
+
+
+def test_request_headers_are_parsed_once_and_case_insensitive():
+    environ = {
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': '/test',
+        'QUERY_STRING': '',
+        'CONTENT_TYPE': 'application/json',
+        'HTTP_X_API_TOKEN': 'token',
+        'SERVER_NAME': 'localhost',
+        'wsgi.input': io.BytesIO(),
+    }
+    request = Request(environ)
+    headers = request.headers
+
+    assert headers['Content-Type'] == headers['content-type'] == 'application/json'
+    assert 'X-Api-Token' in headers
+    assert set(headers) == {'content-type', 'x-api-token'}  # Only real HTTP headers
+    assert request.headers is headers
+    with pytest.raises(TypeError):
+        headers['content-type'] = 'text/html'
+
+
+def test_request_cookies_and_json_are_cached():
+    body = io.BytesIO(b'{"name": "John"}')
+    environ = {
+        'REQUEST_METHOD': 'POST',
+        'PATH_INFO': '/test',
+        'QUERY_STRING': '',
+        'CONTENT_TYPE': 'application/json',
+        'CONTENT_LENGTH': '16',
+        'HTTP_COOKIE': 'theme=dark; session_id=abc=; empty',
+        'wsgi.input': body,
+    }
+    request = Request(environ)
+
+    assert request.cookies == {'theme': 'dark', 'session_id': 'abc='}
+    assert request.extract_session_id() == 'abc='
+    assert request.get_json() == {'name': 'John'}
+    # The body has been consumed, the parsed JSON is reused
+    assert request.get_json() == {'name': 'John'}
+
+
+def make_post(body: bytes, **environ) -> Request:
+    environ.update({'REQUEST_METHOD': 'POST', 'PATH_INFO': '/upload', 'QUERY_STRING': '',
+                    'CONTENT_LENGTH': str(len(body)), 'wsgi.input': io.BytesIO(body)})
+    return Request(environ, max_content_length=environ.pop('max_content_length', None),
+                   spool_threshold=environ.pop('spool_threshold', 1024))
+
+
+def test_request_body_is_read_once_and_spooled():
+    request = make_post(b'x' * 2048, spool_threshold=1024)
+    assert request.body == b'x' * 2048
+    assert request.body is request.body
+    assert request.body_file._rolled  # Past the threshold the body went to a temporary file
+    assert b''.join(request.iter_body(1000)) == b'x' * 2048
+    request.close()
+
+
+def test_request_iter_body_streams_without_buffering():
+    request = make_post(b'abcdefgh')
+    assert list(request.iter_body(3)) == [b'abc', b'def', b'gh']
+    with pytest.raises(RuntimeError):
+        request.body
+
+
+def test_request_body_limit():
+    assert make_post(b'x' * 10, max_content_length=5).too_large
+
+    # Without a Content-Length the limit is enforced while reading
+    request = make_post(b'x' * 10, max_content_length=5)
+    del request.environ['CONTENT_LENGTH']
+    request.environ['wsgi.input_terminated'] = True
+    assert not request.too_large
+    with pytest.raises(RequestEntityTooLarge):
+        request.body
@@ -1,4 +1,11 @@
-from src.core.response import Response
+import asyncio
+
+import pytest
+
+from src.core.prebuilt_response import NOT_FOUND
+from src.core.response import Response, StreamingResponse
+from src.http.headers import Headers
+from src.http.status import STATUS_LINES
 
 
 def test_response_initialization():
@@ -14,3 +21,111 @@ def test_response_set_header():
     response.set_header('Content-Encoding', 'gzip')
     assert response.headers == [('Content-Type', 'application/json'), ('Content-Length', '5'), ('Content-Encoding', 'gzip')]
 
+
+def test_response_headers_keep_repeated_names():
+    response = Response(headers=[('Content-Type', 'text/plain')])
+    response.add_header('Set-Cookie', 'a=1')
+    response.add_header('Set-Cookie', 'b=2')
+    response.headers.append(('X-Custom-Header', 'CustomValue'))
+    assert response.headers.getlist('set-cookie') == ['a=1', 'b=2']
+    assert response.headers_dict['content-type'] == 'text/plain'
+    assert 'x-custom-header' in response.headers
+
+    received = []
+    response({}, lambda status, headers: received.append(headers))
+    assert received[0] == [('Content-Type', 'text/plain'), ('Set-Cookie', 'a=1'), ('Set-Cookie', 'b=2'),
+                           ('X-Custom-Header', 'CustomValue')]
+    # The server gets a copy
+    received[0].clear()
+    assert len(response.headers) == 4
+
+
+def test_headers_set_replaces_every_value():
+    headers = Headers([('Set-Cookie', 'a=1'), ('X-Test', '1'), ('set-cookie', 'b=2')])
+    headers['SET-COOKIE'] = 'c=3'
+    assert headers == [('SET-COOKIE', 'c=3'), ('X-Test', '1')]
+    assert headers.pop('x-test') == '1'
+    assert headers.pop('X-Test', None) is None
+    assert headers.setdefault('Content-Type', 'text/html') == 'text/html'
+    assert dict(headers) == {'SET-COOKIE': 'c=3', 'Content-Type': 'text/html'}
+    with pytest.raises(KeyError):
+        del headers['X-Missing']
+
+
+def test_prebuilt_response_is_immutable_and_copied_for_apps():
+    with pytest.raises(AttributeError):
+        NOT_FOUND.status = '200 OK'
+    response = NOT_FOUND.to_response()
+    response.set_header('X-Test', '1')
+    assert response.status_code == 404
+    assert b''.join(response) == b'Not Found'
+    assert ('X-Test', '1') not in NOT_FOUND.headers
+
+
+def test_str_body_is_wrapped():
+    assert Response('héllo').body == ['héllo'.encode()]
+
+
+def test_streaming_response_from_generator_is_closed():
+    closed = []
+
+    def rows():
+        try:
+            yield b'a,b\n'
+            yield b'1,2\n'
+        finally:
+            closed.append(True)
+
+    response = StreamingResponse(rows(), headers=[('Content-Type', 'text/csv')])
+    body = response.wsgi_body({})
+    assert next(body) == b'a,b\n'
+    body.close()
+    assert closed == [True]
+
+
+def test_streaming_response_uses_file_wrapper(tmp_path):
+    path = tmp_path / 'export.csv'
+    path.write_bytes(b'x' * 100)
+    wrapped = []
+
+    def file_wrapper(file, block_size):
+        wrapped.append(block_size)
+        return iter(lambda: file.read(block_size), b'')
+
+    with open(path, 'rb') as file:
+        response = StreamingResponse(file, block_size=64)
+        assert response.headers_dict['Content-Length'] == '100'
+        assert b''.join(response.wsgi_body({'wsgi.file_wrapper': file_wrapper})) == b'x' * 100
+        assert wrapped == [64]
+
+    with open(path, 'rb') as file:
+        response = StreamingResponse(file, block_size=64)
+        response.transform(bytes.upper)
+        assert 'Content-Length' not in response.headers_dict
+        assert list(response.wsgi_body({'wsgi.file_wrapper': file_wrapper})) == [b'X' * 64, b'X' * 36]
+
+
+def test_streaming_response_from_async_iterator():
+    async def chunks():
+        for chunk in (b'a', b'b', b'c'):
+            await asyncio.sleep(0)
+            yield chunk
+
+    assert b''.join(StreamingResponse(chunks())) == b'abc'
+
+
+def test_status_lines_come_from_the_precomputed_table():
+    assert Response(status=304).status == '304 Not Modified'
+    assert Response(status=405).status == '405 Method Not Allowed'
+    assert Response(status=413).status_code == 413
+    assert Response(status=299).status == '299 Unknown Status'
+    response = Response(status='418 Custom Teapot')
+    assert (response.status_code, response.status_message) == (418, 'Custom Teapot')
+    response.status = 201
+    assert (response.status, response.status_code) == ('201 Created', 201)
+    assert NOT_FOUND.status_code == 404
+    with pytest.raises(ValueError):
+        Response(status='OK')
+    with pytest.raises(TypeError):
+        STATUS_LINES[200] = '200 Fine'
+
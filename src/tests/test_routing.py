@@ -1,4 +1,8 @@
+import pytest
+import uuid
+
 from src.routing.router import Router
+from src.routing.lazy_route import Converter, CONVERTERS
 from src.core.request import Request
 from src.core.response import Response
 
@@ -55,7 +59,7 @@ def test_dynamic_route_matching():
 
     handler, params = router.match('/user/42', 'GET')
     assert handler is not None
-    assert params == {'id': '42'}
+    assert params == {'id': 42}
 
     request = Request({'REQUEST_METHOD': 'GET', 'PATH_INFO': '/user/42'})
     response = handler(request, **params)
@@ -97,3 +101,200 @@ def test_route_with_query_parameters():
     assert response.status == '200 OK'
     assert b''.join(response.body) == b'Test Route'
     assert request.get_query_params() == {'query': ['param']}
+
+
+def test_first_registered_route_wins():
+    router = Router()
+    router.add_route('/user/<name>', 'module_dir', lambda req, name: Response(body=[b'by name']), methods=['GET'])
+    router.add_route('/user/<int:id>', 'module_dir', lambda req, id: Response(body=[b'by id']), methods=['GET'])
+    router.add_route('/user/me', 'module_dir', lambda req: Response(body=[b'me']), methods=['GET'])
+
+    handler, params = router.match('/user/42', 'GET')
+    assert params == {'name': '42'}
+
+    handler, params = router.match('/user/me', 'GET')
+    assert params == {'name': 'me'}
+
+
+def test_static_route_registered_first_wins():
+    router = Router()
+    router.add_route('/user/me', 'module_dir', lambda req: Response(body=[b'me']), methods=['GET'])
+    router.add_route('/user/<name>', 'module_dir', lambda req, name: Response(body=[b'by name']), methods=['GET'])
+
+    handler, params = router.match('/user/me', 'GET')
+    assert params == {}
+    assert b''.join(handler(None).body) == b'me'
+
+    handler, params = router.match('/user/you', 'GET')
+    assert params == {'name': 'you'}
+
+
+def test_route_matching_per_method():
+    router = Router()
+    router.add_route('/item/<int:id>', 'module_dir', lambda req, id: Response(body=[b'get']), methods=['GET'])
+    router.add_route('/item/<int:id>', 'module_dir', lambda req, id: Response(body=[b'post']), methods=['POST'])
+
+    handler, params = router.match('/item/1', 'POST')
+    assert b''.join(handler(None, **params).body) == b'post'
+    assert router.match('/item/abc', 'GET') == (None, {})
+
+
+@pytest.mark.parametrize('engine', ['trie', 'alternation'])
+def test_engine_matches_linear_scan(engine):
+    paths = ['/', '/about', '/user/<int:id>', '/user/<int:id>/posts/<str:slug>', '/greet/<name>',
+             '/files/<name>/raw', '/search/[a-z]+', '/user/<name>']
+    router = Router(engine=engine)
+    linear_router = Router(engine='linear')
+    for index, path in enumerate(paths):
+        for each_router in (router, linear_router):
+            each_router.add_route(path, 'module_dir', lambda req, index=index, **params: index, methods=['GET'])
+
+    for path in ['/', '/about', '/about/', '/user/7', '/user/x', '/user/7/posts/hello', '/greet/bob',
+                 '/greet/', '/files/a/raw', '/search/python', '/search/42', '/nowhere']:
+        handler, params = router.match(path, 'GET')
+        expected_handler, expected_params = linear_router.match(path, 'GET')
+        assert params == expected_params
+        assert (handler(None) if handler else None) == (expected_handler(None) if expected_handler else None)
+    assert router.match('/about', 'POST') == (None, {})
+
+
+def test_unknown_router_engine():
+    with pytest.raises(ValueError):
+        Router(engine='unknown')
+
+
+def test_static_routes_are_indexed():
+    router = Router()
+    router.add_route('/about', 'module_dir', lambda req: Response(body=[b'about']), methods=['GET', 'POST'])
+    router.add_route('/user/<int:id>', 'module_dir', lambda req, id: Response(), methods=['GET'])
+
+    assert set(router.static_routes) == {('GET', '/about'), ('POST', '/about')}
+    handler, params = router.match('/about', 'POST')
+    assert b''.join(handler(None).body) == b'about'
+    assert params == {}
+
+
+def test_static_route_shadowed_by_earlier_dynamic_route():
+    router = Router()
+    router.add_route('/user/<name>', 'module_dir', lambda req, name: Response(body=[b'by name']), methods=['GET'])
+    router.add_route('/user/me', 'module_dir', lambda req: Response(body=[b'me']), methods=['GET', 'POST'])
+
+    # GET /user/me is claimed by the earlier dynamic route, POST /user/me is not
+    assert ('GET', '/user/me') not in router.static_routes
+    assert ('POST', '/user/me') in router.static_routes
+
+    handler, params = router.match('/user/me', 'GET')
+    assert params == {'name': 'me'}
+    handler, params = router.match('/user/me', 'POST')
+    assert b''.join(handler(None).body) == b'me'
+
+
+def test_match_cache_hits_and_negative_caching():
+    router = Router(cache_size=16)
+    router.add_route('/user/<int:id>', 'module_dir', lambda req, id: Response(), methods=['GET'])
+
+    assert router.match('/user/1', 'GET')[1] == {'id': 1}
+    assert router.match('/user/1', 'GET')[1] == {'id': 1}
+    assert router.match('/wp-login.php', 'GET') == (None, {})
+    assert router.match('/wp-login.php', 'GET') == (None, {})
+
+    info = router.cache_info()
+    assert (info['hits'], info['misses'], info['size']) == (2, 2, 2)
+
+
+def test_match_cache_is_invalidated_by_new_routes():
+    router = Router(cache_size=16)
+    assert router.match('/late/1', 'GET') == (None, {})
+
+    router.add_route('/late/<int:id>', 'module_dir', lambda req, id: Response(), methods=['GET'])
+    handler, params = router.match('/late/1', 'GET')
+    assert handler is not None
+    assert params == {'id': 1}
+
+
+def test_allowed_methods_are_cached(monkeypatch):
+    router = Router(cache_size=16)
+    router.add_route('/user/<int:id>', 'module_dir', lambda req, id: Response(), methods=['GET'])
+    router.add_route('/user/<int:id>', 'module_dir', lambda req, id: Response(), methods=['POST'])
+    assert router.allowed_methods('/wp-login.php') == []
+    assert router.allowed_methods('/user/1') == ['GET', 'HEAD', 'OPTIONS', 'POST']
+
+    # Repeated 404s and 405s no longer reach the per-method matchers
+    for matcher in router.matchers.values():
+        monkeypatch.setattr(matcher, 'match', lambda path: pytest.fail('matcher scanned'))
+    assert router.allowed_methods('/wp-login.php') == []
+    assert router.allowed_methods('/user/1') == ['GET', 'HEAD', 'OPTIONS', 'POST']
+    monkeypatch.undo()
+
+    router.add_route('/wp-login.php', 'module_dir', lambda req: Response(), methods=['PUT'])
+    assert router.allowed_methods('/wp-login.php') == ['OPTIONS', 'PUT']
+
+
+def test_match_cache_is_bounded():
+    router = Router(cache_size=2)
+    router.add_route('/user/<int:id>', 'module_dir', lambda req, id: Response(), methods=['GET'])
+    for i in range(10):
+        router.match(f'/user/{i}', 'GET')
+    assert router.cache_info()['size'] == 2
+
+
+@pytest.mark.parametrize('engine', ['trie', 'alternation', 'linear'])
+def test_typed_converters(engine):
+    router = Router(engine=engine)
+    for path in ['/price/<float:amount>', '/order/<uuid:order_id>', '/post/<slug:slug>', '/files/<path:file_path>',
+                 '/user/<int:id>']:
+        router.add_route(path, 'module_dir', lambda req, **params: Response(), methods=['GET'])
+
+    assert router.match('/price/9.99', 'GET')[1] == {'amount': 9.99}
+    assert router.match('/price/9', 'GET') == (None, {})
+    assert router.match('/order/12345678-1234-5678-1234-567812345678', 'GET')[1] == {
+        'order_id': uuid.UUID('12345678-1234-5678-1234-567812345678')}
+    assert router.match('/post/hello-world_2', 'GET')[1] == {'slug': 'hello-world_2'}
+    assert router.match('/post/hello.world', 'GET') == (None, {})
+    assert router.match('/files/css/site/main.css', 'GET')[1] == {'file_path': 'css/site/main.css'}
+    assert router.match('/user/12', 'GET')[1] == {'id': 12}
+
+
+@pytest.mark.parametrize('engine', ['trie', 'alternation', 'linear'])
+def test_custom_converter(engine, monkeypatch):
+    class EvenConverter(Converter):
+        regex = r'[0-9]+'
+
+        def to_python(self, value: str) -> int:
+            if int(value) % 2:
+                raise ValueError(f"{value} is odd")
+            return int(value)
+
+    monkeypatch.setitem(CONVERTERS, 'even', EvenConverter())
+    router = Router(engine=engine)
+    router.add_route('/n/<even:n>', 'module_dir', lambda req, n: Response(body=[b'even']), methods=['GET'])
+    router.add_route('/n/<int:n>', 'module_dir', lambda req, n: Response(body=[b'odd']), methods=['GET'])
+
+    handler, params = router.match('/n/4', 'GET')
+    assert (b''.join(handler(None, **params).body), params) == (b'even', {'n': 4})
+    handler, params = router.match('/n/5', 'GET')
+    assert (b''.join(handler(None, **params).body), params) == (b'odd', {'n': 5})
+
+
+def test_unknown_converter():
+    with pytest.raises(ValueError):
+        Router().add_route('/n/<roman:n>', 'module_dir', lambda req, n: Response(), methods=['GET'])
+
+
+def test_url_for():
+    router = Router()
+    router.add_route('/user/<int:id>', 'module_dir', lambda req, id: Response(), methods=['GET'], name='get_user')
+    router.add_route('/greet/<name>', 'module_dir', lambda req, name: Response(), methods=['GET'], name='greet')
+    router.add_route('/files/<path:file_path>', 'module_dir', lambda req, file_path: Response(), methods=['GET'],
+                     name='files')
+
+    assert router.url_for('get_user', {'id': 42}) == '/user/42'
+    assert router.url_for('greet', {'name': 'John Doe'}) == '/greet/John%20Doe'
+    assert router.url_for('files', {'file_path': 'css/main.css'}) == '/files/css/main.css'
+    assert router.url_for('get_user', {'id': 1, 'page': 2}) == '/user/1?page=2'
+    assert router.urls_for('get_user', [{'id': i} for i in range(3)]) == ['/user/0', '/user/1', '/user/2']
+
+    with pytest.raises(ValueError):
+        router.url_for('get_user', {})
+    with pytest.raises(ValueError):
+        router.url_for('unknown', {})
@@ -4,6 +4,8 @@ import os
 import sys
 
 from src.app_registry import AppRegistry
+from src.cache.cache_decorator import cache_view
+from src.core.response import Response
 from src.database.orm_initializer import initialize_orm
 from src.middleware.session_middleware import SessionMiddleware
 from src.tests.test_client import FrameworkTestClient
@@ -300,3 +302,16 @@ def test_undo_redo_sessions(client):
     session_store.redo()
     session = session_store.get_session_by_id(session_id)
     assert session.get('key') == 'value2', "Session value not restored correctly"
+
+
+def test_cached_view_does_not_accumulate_session_cookies(app, client):
+    @app.route('/cached')
+    @cache_view(timeout=60)
+    def cached(request_context):
+        return Response(body=[b'cached page'])
+
+    for _ in range(3):
+        response = client.get('/cached')
+        cookies = [header for header in response.headers if header[0].lower() == 'set-cookie']
+        assert response.body == [b'cached page']
+        assert len(cookies) == 1, "Each visitor gets exactly its own session cookie"
@@ -0,0 +1,42 @@
+import pytest
+
+from src.core.prebuilt_response import NOT_FOUND
+from src.middleware.static_files_middleware import StaticFilesMiddleware
+
+
+@pytest.fixture
+def static_files(tmp_path):
+    assets = tmp_path / 'assets'
+    (assets / 'css').mkdir(parents=True)
+    (assets / 'css' / 'styles.css').write_bytes(b'body {}')
+    (tmp_path / 'secret.txt').write_bytes(b'secret')
+    return StaticFilesMiddleware(NOT_FOUND, '/assets', str(assets))
+
+
+def get(middleware, path, method='GET'):
+    started = {}
+
+    def start_response(status, headers, exc_info=None):
+        started.update(status=status, headers=dict(headers))
+
+    body = b''.join(middleware({'REQUEST_METHOD': method, 'PATH_INFO': path}, start_response))
+    return started['status'], started['headers'], body
+
+
+def test_serves_files_under_prefix(static_files):
+    status, headers, body = get(static_files, '/assets/css/styles.css')
+    assert status == '200 OK'
+    assert headers['Content-type'] == 'text/css'
+    assert body == b'body {}'
+    assert get(static_files, '/assets/css/styles.css', method='HEAD')[2] == b''
+
+
+def test_other_paths_reach_the_app(static_files):
+    assert get(static_files, '/assets/missing.css')[0] == '404 Not Found'
+    assert get(static_files, '/other/styles.css')[0] == '404 Not Found'
+    assert get(static_files, '/assets/css/styles.css', method='POST')[0] == '404 Not Found'
+
+
+def test_rejects_paths_outside_directory(static_files):
+    assert get(static_files, '/assets/../secret.txt')[0] == '404 Not Found'
+    assert get(static_files, '/assets//etc/passwd')[0] == '404 Not Found'
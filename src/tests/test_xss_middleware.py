@@ -4,7 +4,7 @@ import pytest
 
 from src.middleware.xss_protection_middleware import XSSProtectionMiddleware
 from src.core.request_context import RequestContext
-from src.core.response import Response
+from src.core.response import Response, StreamingResponse
 from src.app import App
 from src.core.request import Request
 
@@ -67,3 +67,17 @@ def test_xss_protection_middleware_integration(app, request_context):
                "Content-Security-Policy"
            ] == (f"default-src 'self'; style-src 'self' 'nonce-{nonce}'; script-src 'self' 'nonce-{nonce}'; "
                  f"object-src 'none';")
+
+
+def test_xss_protection_middleware_keeps_responses_streaming(request_context, tmp_path):
+    xss_protection_middleware = XSSProtectionMiddleware()
+    path = tmp_path / 'export.csv'
+    path.write_bytes(b'a,b\n')
+    with open(path, 'rb') as file:
+        response = xss_protection_middleware.after_request(request_context, StreamingResponse(file))
+        assert response.file is file  # Non-HTML bodies are not transformed and can still be sent with sendfile
+        assert 'Content-Security-Policy' in response.headers_dict
+
+    html = StreamingResponse(iter([b'<p>', b'hi</p>']), headers=[('Content-Type', 'text/html; charset=utf-8')])
+    response = xss_protection_middleware.after_request(request_context, html)
+    assert b''.join(response) == b'<p>hi</p>'
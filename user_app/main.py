@@ -4,11 +4,11 @@ from src.database.orm_initializer import initialize_orm
 from src.middleware.authentication_middleware import AuthenticationMiddleware
 from src.middleware.session_middleware import SessionMiddleware
 from src.middleware.csrf_middleware import CSRFMiddleware
-from src.middleware.static_middleware import StaticMiddleware
 from src.middleware.xss_protection_middleware import XSSProtectionMiddleware
 from src.middleware.cors_middleware import CORSMiddleware
 from src.signals.signal_manager import SignalManager
 from src.middleware.response_time_middleware import ResponseTimeMiddleware
+from src.middleware.compression_middleware import CompressionMiddleware
 
 from user_app.modules.user_module.hooks import some_hooks
 from user_app.modules.user_module.views import hello_views, user_views, another_view
@@ -33,13 +33,15 @@ user_mod = app_registry.create_module('user_module', app)
 user_mod.use_middleware(ResponseTimeMiddleware, signal_manager)  # TODO change second argument must be signal_manager
 user_mod.use_middleware(CORSMiddleware, config)
 user_mod.use_middleware(XSSProtectionMiddleware)
-user_mod.use_middleware(StaticMiddleware)
+# Assets are served by the StaticFilesMiddleware of the Dispatcher (see wsgi.py)
 # Apply SessionMiddleware
 user_mod.use_middleware(SessionMiddleware, config)
 # Apply CSRFMiddleware (it works together with SessionMiddleware)
 # user_mod.use_middleware(CSRFMiddleware, config)
 # Apply AuthenticationMiddleware after SessionMiddleware
 user_mod.use_middleware(AuthenticationMiddleware, config)
+# Apply CompressionMiddleware last, so it compresses the final body
+user_mod.use_middleware(CompressionMiddleware)
 
 
 # # Register user module hooks
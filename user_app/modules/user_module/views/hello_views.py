@@ -1,9 +1,9 @@
 import datetime
-import json
 import jwt
 
 from src.core.request_context import RequestContext
 from src.core.response import Response
+from src.http import json_codec
 
 from user_app.modules.user_module.proxy.request_proxy import RequestProxy
 from user_app.modules.user_module.views.common_handlers import HelloWorldHandler, ProxyExampleHandler
@@ -39,8 +39,7 @@ def register_routes(module):
     # -d '{"username": "jwt-test-user"}'`
     @module.route('/generate-token', methods=['POST'])
     def generate_token_handler(request_context: RequestContext) -> Response:
-        body = request_context.body.decode('utf-8')
-        body_json = json.loads(body)
+        body_json = json_codec.loads(request_context.body)
         if body_json and body_json.get('username') == 'jwt-test-user':
             payload = {
                 'user': 'jwt-test-user',
@@ -1,9 +1,5 @@
-import json
-
-from typing import List, Tuple
-
 from src.core.request_context import RequestContext
-from src.core.response import Response
+from src.core.response import JSONResponse, Response
 from src.database.orm_interface import ORMInterface
 from src.http.http_response_builder import HTTPResponseBuilder
 from src.http.json_response_builder import JSONResponseBuilder
@@ -52,63 +48,40 @@ def register_routes(module, orm: ORMInterface):
     @module.route('/greet/<name>')
     def greet_handler(request_context: RequestContext, name: str = "Guest") -> Response:
         data = {'message': f'Hello, {name}!'}
-        status: str = '200 OK'
-        headers: List[Tuple[str, str]] = [('Content-type', 'application/json')]
-        return Response(status=status, headers=headers, body=[json.dumps(data).encode('utf-8')])
+        return JSONResponse(data, status='200 OK')
 
     @module.route('/users')
     def list_users(request_context: RequestContext) -> Response:
         users = orm.all(User)
         users_data = [{'id': user.id, 'username': user.username} for user in users]
-        return Response(
-            status='200 OK',
-            headers=[('Content-Type', 'application/json')],
-            body=[json.dumps(users_data).encode('utf-8')]
-        )
+        return JSONResponse(users_data, status='200 OK')
 
     @module.route('/create_user', methods=['POST'])
     def create_user_view(request_context: RequestContext) -> Response:
         data = request_context.get_json()
 
         if not data or 'username' not in data or 'password' not in data:
-            return Response(
-                status='400 Bad Request',
-                headers=[('Content-Type', 'application/json')],
-                body=[json.dumps({'error': 'Invalid input'}).encode('utf-8')]
-            )
+            return JSONResponse({'error': 'Invalid input'}, status='400 Bad Request')
 
         username = data['username']
         password = data['password']
         user = orm.create(User, username=username, password=password)
-        return Response(
-            status='201 Created',
-            headers=[('Content-Type', 'application/json')],
-            body=[json.dumps({'id': user.id, 'username': user.username}).encode('utf-8')]
-        )
+        return JSONResponse({'id': user.id, 'username': user.username}, status='201 Created')
 
     @module.route('/user/<int:id>')
     def get_user(request_context: RequestContext, id: int) -> Response:
-        id = int(id)  # Ensure id is an integer
         user = orm.get_by_id(User, id)
         if user:
             user_data = {'id': user.id, 'username': user.username}
-            return Response(
-                status='200 OK',
-                headers=[('Content-Type', 'application/json')],
-                body=[json.dumps(user_data).encode('utf-8')]
-            )
+            return JSONResponse(user_data, status='200 OK')
         else:
-            return Response(
-                status='404 Not Found',
-                headers=[('Content-Type', 'application/json')],
-                body=[json.dumps({'error': 'User not found'}).encode('utf-8')]
-            )
+            return JSONResponse({'error': 'User not found'}, status='404 Not Found')
 
     @module.route('/filter_users/<str:username>', methods=['GET'])
     def filter_users(request: RequestContext, username: str) -> Response:
         users = orm.filter(User, username=username)
-        user_list = [user.__dict__ for user in users]
-        return Response(status='200 OK', body=[json.dumps(user_list).encode('utf-8')])
+        user_list = [{'id': user.id, 'username': user.username} for user in users]
+        return JSONResponse(user_list, status='200 OK')
 
     @module.route('/register', methods=['GET', 'POST'])
     @module.route('/register/admin', methods=['GET', 'POST'])
@@ -1,9 +1,21 @@
+import os
+
+from src.config import config
 from src.core.dispatcher import Dispatcher
+from src.core.health import background_worker_check
+from src.middleware.request_id_middleware import RequestIDMiddleware
+from src.middleware.static_files_middleware import StaticFilesMiddleware
 
 from user_app.main import app_registry as user_app_registry
+from user_app.modules.user_module.views.user_views import background_worker
 from admin_app.main import app_registry as admin_app_registry
 
-dispatcher = Dispatcher()
+dispatcher = Dispatcher(favicon_path=config.FAVICON_PATH, readiness_cache_ttl=config.READINESS_CACHE_TTL)
+
+# Dispatcher middlewares run once per request for every app, before any app is involved
+dispatcher.use(RequestIDMiddleware)
+# Assets are answered from memory without going through the user_app pipeline
+dispatcher.use(StaticFilesMiddleware, '/assets', os.path.join(os.path.dirname(__file__), 'user_app', 'assets'))
 
 user_app = user_app_registry.get_app('user_app')
 dispatcher.add_app('/', user_app)
@@ -12,5 +24,12 @@ dispatcher.add_app('/', user_app)
 admin_app = admin_app_registry.get_app('admin_app')
 dispatcher.add_app('/admin', admin_app)
 
+# /readyz reports the instance as not ready while the background task queue is backed up
+dispatcher.add_readiness_check('background_worker', background_worker_check(background_worker))
+
+# Every module and plugin has registered by now: precompile routes, middlewares and hooks
+user_app_registry.freeze_all()
+admin_app_registry.freeze_all()
+
 # WSGI application entry point
 application = dispatcher